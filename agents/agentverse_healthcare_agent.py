@@ -3,6 +3,7 @@
 MediTech AI Healthcare Agent for Agentverse
 """
 
+import re
 from datetime import datetime
 from uuid import uuid4
 from uagents import Agent, Context, Protocol
@@ -61,6 +62,219 @@ def create_text_chat(text: str, end_session: bool = False) -> ChatMessage:
         content=content,
     )
 
+# Fallback sent instead of a blank response
+BLANK_RESPONSE_FALLBACK = (
+    "🩺 **MEDITECH AI HEALTHCARE ASSISTANT** 🩺\n\n"
+    "I apologize, but I encountered an issue processing your request. Please try again with a clear symptom description.\n\n"
+    "**💡 EXAMPLE:** \"I have a headache and feel dizzy\"\n\n"
+    "🩺 **I'm here to help with your health concerns!**"
+)
+
+def ensure_nonempty_response(response_text: str) -> str:
+    """Return response_text, or the standard fallback if it is blank"""
+    if not response_text or response_text.isspace():
+        return BLANK_RESPONSE_FALLBACK
+    return response_text
+
+# Static response sections, built once at import instead of per message
+
+# Reply to positive feedback
+POSITIVE_FEEDBACK_RESPONSE = (
+    "🩺 **MEDITECH AI HEALTHCARE ASSISTANT** 🩺\n\n"
+    "✅ **Thank you for your feedback!**\n\n"
+    "I'm glad the analysis was helpful and accurate. Your feedback improves my future diagnoses.\n\n"
+    "**🔄 What’s Next?**\n"
+    "• Let me know if you have more symptoms to analyze.\n"
+    "• Ask about self-care tips for your condition (e.g., 'self-care for migraine').\n"
+    "• Request follow-up questions (e.g., 'ask more about my symptoms').\n\n"
+    "**💡 Examples:**\n"
+    "• \"I have chest pain now\"\n"
+    "• \"Self-care for migraine\"\n"
+    "• \"Ask more about my headache\"\n\n"
+    "🩺 **Always here to support your health!**"
+)
+
+# Guidance on how to describe symptoms
+SYMPTOM_GUIDANCE_RESPONSE = (
+    "🩺 **MEDITECH AI HEALTHCARE ASSISTANT** 🩺\n\n"
+    "I'm ready to analyze your symptoms! Here's how to get the best analysis:\n\n"
+    "**📝 HOW TO DESCRIBE YOUR SYMPTOMS:**\n"
+    "• Be specific about what you're experiencing\n"
+    "• Include duration (how long you've had symptoms)\n"
+    "• Mention severity (mild, moderate, severe)\n"
+    "• Include any associated symptoms\n\n"
+    "**💡 EXAMPLES OF GOOD SYMPTOM DESCRIPTIONS:**\n"
+    "• \"I have chest pain that started 2 hours ago, it's severe and I feel short of breath\"\n"
+    "• \"I've had a fever of 101°F for 3 days with a dry cough and fatigue\"\n"
+    "• \"I feel dizzy when I stand up, and I've been pale and tired for a week\"\n"
+    "• \"I have a headache that's been getting worse over 2 days, with nausea\"\n\n"
+    "**🚨 EMERGENCY SYMPTOMS:**\n"
+    "If you have chest pain, difficulty breathing, severe bleeding, or loss of consciousness, call 911 immediately!\n\n"
+    "**📋 READY FOR ANALYSIS:**\n"
+    "Please describe your symptoms and I'll provide intelligent analysis with possible diagnoses, treatment recommendations, and urgency assessment.\n\n"
+    "💡 **Please provide your specific symptoms for analysis.**"
+)
+
+# Overview of agent capabilities
+CAPABILITIES_OVERVIEW_RESPONSE = (
+    "🩺 **MEDITECH AI HEALTHCARE ASSISTANT - CAPABILITIES OVERVIEW** 🩺\n\n"
+    "**🔍 HOW I ANALYZE SYMPTOMS:**\n"
+    "1. **Intelligent Pattern Recognition** - I identify symptoms using advanced keyword matching\n"
+    "2. **Medical Knowledge Base** - I have access to 50+ medical conditions across all body systems\n"
+    "3. **Symptom Combination Analysis** - I analyze how symptoms work together to suggest diagnoses\n"
+    "4. **Confidence Scoring** - I provide confidence levels for each possible diagnosis\n"
+    "5. **Urgency Assessment** - I categorize conditions as emergency, urgent, moderate, or routine\n\n"
+    "**💊 HOW I GENERATE TREATMENT PLANS:**\n"
+    "1. **Evidence-Based Recommendations** - Based on medical literature and best practices\n"
+    "2. **Specific Medications** - I suggest appropriate medications and dosages\n"
+    "3. **Lifestyle Modifications** - Diet, exercise, and behavioral changes\n"
+    "4. **Emergency Protocols** - Immediate actions for critical conditions\n"
+    "5. **Follow-up Care** - When to seek additional medical attention\n\n"
+    "**🏥 MEDICAL SYSTEMS I COVER:**\n"
+    "• **Gastrointestinal** - Digestive issues, abdominal pain, nausea, vomiting\n"
+    "• **Neurological** - Headaches, seizures, tremors, numbness, weakness\n"
+    "• **Cardiovascular** - Chest pain, palpitations, shortness of breath\n"
+    "• **Respiratory** - Cough, breathing problems, wheezing\n"
+    "• **Endocrine** - Diabetes, thyroid disorders, weight changes\n"
+    "• **Musculoskeletal** - Joint pain, arthritis, muscle pain\n"
+    "• **Dermatological** - Rashes, skin conditions, itching\n"
+    "• **Urological** - Urinary problems, kidney issues\n"
+    "• **Psychiatric** - Depression, anxiety, mood disorders\n"
+    "• **Eye & Ear** - Vision problems, hearing issues\n\n"
+    "**⚡ EMERGENCY DETECTION:**\n"
+    "I can identify critical conditions requiring immediate medical attention:\n"
+    "• Heart attacks, strokes, severe bleeding\n"
+    "• Appendicitis, pulmonary embolism\n"
+    "• Retinal detachment, pneumothorax\n\n"
+    "**📊 ANALYSIS FORMAT:**\n"
+    "• **Symptom Analysis Report** with detected patterns\n"
+    "• **Most Likely Diagnosis** with confidence percentage\n"
+    "• **Treatment Plan** with specific recommendations\n"
+    "• **Other Possible Conditions** with confidence levels\n"
+    "• **Urgency Assessment** and next steps\n\n"
+    "**🎯 READY TO ANALYZE:**\n"
+    "Simply describe your symptoms and I'll provide comprehensive medical analysis with intelligent diagnosis and treatment recommendations!\n\n"
+    "**Example:** \"I have chest pain, shortness of breath, and nausea\"\n"
+    "**Example:** \"Persistent headache with dizziness and fatigue\"\n"
+    "**Example:** \"Rash with itching and fever\""
+)
+
+# Fever + cough + fatigue combination
+FEVER_COUGH_FATIGUE_RESPONSE = (
+    "🩺 **SYMPTOM ANALYSIS: FEVER + COUGH + FATIGUE**\n\n"
+    "**📋 SYMPTOM COMBINATION ANALYSIS:**\n"
+    "The combination of fever, cough, and fatigue suggests several possible conditions:\n\n"
+    "**🔍 MOST LIKELY DIAGNOSES:**\n"
+    "• **Viral Upper Respiratory Infection (Common Cold)**\n"
+    "• **Influenza (Flu)**\n"
+    "• **COVID-19**\n"
+    "• **Bronchitis**\n"
+    "• **Sinus Infection**\n\n"
+    "**💊 RECOMMENDED TREATMENT PLAN:**\n"
+    "• **Rest and hydration** - Get plenty of sleep and drink fluids\n"
+    "• **Over-the-counter medications:**\n"
+    "  - Acetaminophen or ibuprofen for fever and body aches\n"
+    "  - Cough suppressants or expectorants\n"
+    "  - Decongestants if nasal congestion present\n"
+    "• **Home remedies:**\n"
+    "  - Warm salt water gargles for throat irritation\n"
+    "  - Steam inhalation for cough relief\n"
+    "  - Honey and lemon for cough\n\n"
+    "**⚠️ WHEN TO SEEK MEDICAL CARE:**\n"
+    "• Fever above 103°F (39.4°C) or persistent for 3+ days\n"
+    "• Difficulty breathing or shortness of breath\n"
+    "• Severe headache or neck stiffness\n"
+    "• Chest pain or pressure\n"
+    "• Symptoms worsen after 7-10 days\n\n"
+    "**🕐 EXPECTED RECOVERY TIME:**\n"
+    "• Common cold: 7-10 days\n"
+    "• Flu: 1-2 weeks\n"
+    "• COVID-19: 2-3 weeks (varies)\n"
+)
+
+# Headache + dizziness combination
+HEADACHE_DIZZINESS_RESPONSE = (
+    "🩺 **SYMPTOM ANALYSIS: HEADACHE + DIZZINESS**\n\n"
+    "**📋 SYMPTOM COMBINATION ANALYSIS:**\n"
+    "The combination of persistent headaches and occasional dizziness suggests:\n\n"
+    "**🔍 MOST LIKELY DIAGNOSES:**\n"
+    "• **Tension Headaches** with vestibular involvement\n"
+    "• **Migraine with vestibular symptoms**\n"
+    "• **Dehydration**\n"
+    "• **Low blood pressure**\n"
+    "• **Inner ear disorders** (BPPV, labyrinthitis)\n"
+    "• **Anxiety or stress-related**\n\n"
+    "**💊 RECOMMENDED TREATMENT PLAN:**\n"
+    "• **Immediate measures:**\n"
+    "  - Stay hydrated (8-10 glasses water daily)\n"
+    "  - Rest in a quiet, dark room\n"
+    "  - Avoid sudden head movements\n"
+    "• **Medications:**\n"
+    "  - Ibuprofen or acetaminophen for headache\n"
+    "  - Anti-nausea medication if needed\n"
+    "• **Lifestyle modifications:**\n"
+    "  - Regular sleep schedule\n"
+    "  - Stress management techniques\n"
+    "  - Avoid triggers (caffeine, alcohol, certain foods)\n\n"
+    "**⚠️ WHEN TO SEEK MEDICAL CARE:**\n"
+    "• Severe, sudden headache (thunderclap headache)\n"
+    "• Headache with fever, neck stiffness, or rash\n"
+    "• Persistent dizziness affecting daily activities\n"
+    "• Vision changes or difficulty speaking\n"
+    "• Headaches that worsen over time\n"
+)
+
+# General medical knowledge base overview
+GENERAL_KNOWLEDGE_RESPONSE = (
+    "🏥 **MEDICAL KNOWLEDGE BASE** 🏥\n\n"
+    "Here are common symptoms and their possible diagnoses:\n\n"
+    "**🌡️ FEVER (Elevated Temperature):**\n"
+    "• Common cold or flu\n"
+    "• Bacterial or viral infections\n"
+    "• Urinary tract infection\n"
+    "• COVID-19\n"
+    "• Autoimmune conditions\n\n"
+    "**🤧 COUGH:**\n"
+    "• Common cold or flu\n"
+    "• Allergies or asthma\n"
+    "• Bronchitis or pneumonia\n"
+    "• COVID-19\n"
+    "• Acid reflux (GERD)\n\n"
+    "**🤕 HEADACHE:**\n"
+    "• Tension headache\n"
+    "• Migraine\n"
+    "• Sinus infection\n"
+    "• Dehydration\n"
+    "• Stress or fatigue\n\n"
+    "**🤢 NAUSEA:**\n"
+    "• Food poisoning\n"
+    "• Motion sickness\n"
+    "• Pregnancy\n"
+    "• Medication side effects\n"
+    "• Gastrointestinal issues\n\n"
+    "**💨 SHORTNESS OF BREATH:**\n"
+    "• Asthma\n"
+    "• Anxiety or panic attacks\n"
+    "• Heart conditions\n"
+    "• Lung infections\n"
+    "• Allergic reactions\n\n"
+    "**🫀 CHEST PAIN:**\n"
+    "• Heart attack (EMERGENCY)\n"
+    "• Angina\n"
+    "• Muscle strain\n"
+    "• Acid reflux\n"
+    "• Anxiety\n\n"
+    "**⚠️ IMPORTANT:**\n"
+    "This is general information only. Always consult a healthcare professional for proper diagnosis and treatment."
+)
+
+# Disclaimer appended to every analysis response
+DISCLAIMER_FOOTER = (
+    "\n\n---\n"
+    "⚠️ **IMPORTANT DISCLAIMER:**\n"
+    "This AI assistant provides general health information only and cannot replace professional medical advice, diagnosis, or treatment. Always consult with qualified healthcare providers for medical concerns."
+)
+
 # Enhanced Medical Knowledge Base
 MEDICAL_KNOWLEDGE = {
     "emergency_keywords": [
@@ -939,6 +1153,33 @@ CONDITION_RARITY = {
     "urinary_tract_infection": 0.3, "pneumonia": 0.4, "asthma": 0.3, "flu": 0.3
 }
 
+# Single-pass triage scanner for patient context and language cues.
+# Each named group is a flag; one finditer() replaces the chained any(... in ...) scans.
+# Age and gender words must be whole words (with their plural and compound
+# forms listed); language cues are word stems, so they only need to start a
+# word ("Kopfschmerzen", "dolores")
+TRIAGE_KEYWORD_PATTERN = re.compile(
+    r"\b(?:"
+    r"(?:"
+    r"(?P<pediatric>child(?:ren)?|kids?|bab(?:y|ies)|infants?|toddlers?|teen(?:ager)?s?)"
+    r"|(?P<elderly>elderly|seniors?|old(?:er)?|aged|retired)"
+    r"|(?P<adult>adults?|middle-aged)"
+    r"|(?P<pregnancy>pregnant|pregnancy|gestational|prenatal)"
+    r"|(?P<male>males?|m[ae]n|boys?|(?:grand)?fathers?)"
+    r"|(?P<female>females?|wom[ae]n|girls?|(?:grand)?mothers?)"
+    r")\b"
+    r"|(?P<es>dolor|cabeza|fiebre|tos)"
+    r"|(?P<fr>douleur|tete|fievre|toux)"
+    r"|(?P<de>schmerz|kopf|fieber|husten)"
+    r"|(?P<it>dolore|testa|febbre|tosse)"
+    r")",
+    re.IGNORECASE,
+)
+
+def detect_triage_flags(text: str) -> set:
+    """Return the set of triage flags (context/language group names) found in text"""
+    return {match.lastgroup for match in TRIAGE_KEYWORD_PATTERN.finditer(text)}
+
 # User feedback storage for state management
 from collections import defaultdict
 USER_FEEDBACK_STORE = defaultdict(list)
@@ -1329,24 +1570,25 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
                 await ctx.send(sender, response_message)
                 continue
             
-            # Detect age and gender context
+            # Detect age, gender and language context in a single scan
+            triage_flags = detect_triage_flags(item.text)
             age_context = None
             gender_context = None
             
             # Age detection
-            if any(word in text_lower for word in ["child", "kid", "baby", "infant", "toddler", "teenager", "teen"]):
+            if "pediatric" in triage_flags:
                 age_context = "pediatric"
-            elif any(word in text_lower for word in ["elderly", "senior", "old", "aged", "retired"]):
+            elif "elderly" in triage_flags:
                 age_context = "elderly"
-            elif any(word in text_lower for word in ["adult", "middle-aged"]):
+            elif "adult" in triage_flags:
                 age_context = "adult"
             
             # Gender detection
-            if any(word in text_lower for word in ["pregnant", "pregnancy", "gestational", "prenatal"]):
+            if "pregnancy" in triage_flags:
                 gender_context = "pregnancy"
-            elif any(word in text_lower for word in ["male", "man", "boy", "father"]):
+            elif "male" in triage_flags:
                 gender_context = "male"
-            elif any(word in text_lower for word in ["female", "woman", "girl", "mother"]):
+            elif "female" in triage_flags:
                 gender_context = "female"
             
             # Check for feedback responses first (enhanced detection)
@@ -1387,18 +1629,7 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
                 ctx.logger.info(f"FEEDBACK DETECTED from {sender}: {text_lower}")
                 
                 if "yes" in text_lower or "matches" in text_lower or "correct" in text_lower or "accurate" in text_lower:
-                    response_text = "🩺 **MEDITECH AI HEALTHCARE ASSISTANT** 🩺\n\n"
-                    response_text += "✅ **Thank you for your feedback!**\n\n"
-                    response_text += "I'm glad the analysis was helpful and accurate. Your feedback improves my future diagnoses.\n\n"
-                    response_text += "**🔄 What’s Next?**\n"
-                    response_text += "• Let me know if you have more symptoms to analyze.\n"
-                    response_text += "• Ask about self-care tips for your condition (e.g., 'self-care for migraine').\n"
-                    response_text += "• Request follow-up questions (e.g., 'ask more about my symptoms').\n\n"
-                    response_text += "**💡 Examples:**\n"
-                    response_text += "• \"I have chest pain now\"\n"
-                    response_text += "• \"Self-care for migraine\"\n"
-                    response_text += "• \"Ask more about my headache\"\n\n"
-                    response_text += "🩺 **Always here to support your health!**"
+                    response_text = POSITIVE_FEEDBACK_RESPONSE
                 else:
                     # Enhanced feedback handling with previous context
                     response_text = "🩺 **MEDITECH AI HEALTHCARE ASSISTANT** 🩺\n\n"
@@ -1433,9 +1664,7 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
                     response_text += "🩺 **I'm here to help get you the most accurate analysis possible!**"
                 
                 # Add disclaimers and timestamp
-                response_text += "\n\n---\n"
-                response_text += "⚠️ **IMPORTANT DISCLAIMER:**\n"
-                response_text += "This AI assistant provides general health information only and cannot replace professional medical advice, diagnosis, or treatment. Always consult with qualified healthcare providers for medical concerns."
+                response_text += DISCLAIMER_FOOTER
                 response_text += f"\n\n🕐 **Assessment Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
                 response_text += f"\n🤖 **AI Agent:** MediTech Healthcare Assistant"
                 
@@ -1477,23 +1706,7 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
                ("what medical concerns" in text_lower and "analyze" in text_lower and not has_analysis_request) or \
                ("would you like me to analyze" in text_lower and not has_analysis_request):
                 # Provide guidance on how to use the agent
-                response_text = "🩺 **MEDITECH AI HEALTHCARE ASSISTANT** 🩺\n\n"
-                response_text += "I'm ready to analyze your symptoms! Here's how to get the best analysis:\n\n"
-                response_text += "**📝 HOW TO DESCRIBE YOUR SYMPTOMS:**\n"
-                response_text += "• Be specific about what you're experiencing\n"
-                response_text += "• Include duration (how long you've had symptoms)\n"
-                response_text += "• Mention severity (mild, moderate, severe)\n"
-                response_text += "• Include any associated symptoms\n\n"
-                response_text += "**💡 EXAMPLES OF GOOD SYMPTOM DESCRIPTIONS:**\n"
-                response_text += "• \"I have chest pain that started 2 hours ago, it's severe and I feel short of breath\"\n"
-                response_text += "• \"I've had a fever of 101°F for 3 days with a dry cough and fatigue\"\n"
-                response_text += "• \"I feel dizzy when I stand up, and I've been pale and tired for a week\"\n"
-                response_text += "• \"I have a headache that's been getting worse over 2 days, with nausea\"\n\n"
-                response_text += "**🚨 EMERGENCY SYMPTOMS:**\n"
-                response_text += "If you have chest pain, difficulty breathing, severe bleeding, or loss of consciousness, call 911 immediately!\n\n"
-                response_text += "**📋 READY FOR ANALYSIS:**\n"
-                response_text += "Please describe your symptoms and I'll provide intelligent analysis with possible diagnoses, treatment recommendations, and urgency assessment.\n\n"
-                response_text += "💡 **Please provide your specific symptoms for analysis.**"
+                response_text = SYMPTOM_GUIDANCE_RESPONSE
                 
                 # Send response
                 response_message = create_text_chat(response_text)
@@ -1696,16 +1909,16 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
                     
                     # Detect language and provide localized emergency numbers
                     detected_language = "en"  # Default to English
-                    if any(term in text_lower for term in ["dolor", "cabeza", "fiebre", "tos"]):
+                    if "es" in triage_flags:
                         detected_language = "es"
                         response_text += "• **🇪🇸 España:** 112 (Emergencias)\n"
-                    elif any(term in text_lower for term in ["douleur", "tete", "fievre", "toux"]):
+                    elif "fr" in triage_flags:
                         detected_language = "fr"
                         response_text += "• **🇫🇷 France:** 112 (Urgences)\n"
-                    elif any(term in text_lower for term in ["schmerz", "kopf", "fieber", "husten"]):
+                    elif "de" in triage_flags:
                         detected_language = "de"
                         response_text += "• **🇩🇪 Deutschland:** 112 (Notfall)\n"
-                    elif any(term in text_lower for term in ["dolore", "testa", "febbre", "tosse"]):
+                    elif "it" in triage_flags:
                         detected_language = "it"
                         response_text += "• **🇮🇹 Italia:** 112 (Emergenza)\n"
                     else:
@@ -1745,9 +1958,7 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
                     response_text += "⚠️ **IMPORTANT DISCLAIMER:** This AI provides general health info only. Consult healthcare providers for medical concerns."
                 
                 # Add disclaimers
-                response_text += "\n\n---\n"
-                response_text += "⚠️ **IMPORTANT DISCLAIMER:**\n"
-                response_text += "This AI assistant provides general health information only and cannot replace professional medical advice, diagnosis, or treatment. Always consult with qualified healthcare providers for medical concerns."
+                response_text += DISCLAIMER_FOOTER
                 
                 # Add timestamp
                 response_text += f"\n\n🕐 **Assessment Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
@@ -1761,51 +1972,7 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
             elif is_general_question:
                 # Check if user is asking about agent capabilities
                 if "how do you" in text_lower or "how does" in text_lower or "brief overview" in text_lower or "overview of how" in text_lower:
-                    response_text = "🩺 **MEDITECH AI HEALTHCARE ASSISTANT - CAPABILITIES OVERVIEW** 🩺\n\n"
-                    response_text += "**🔍 HOW I ANALYZE SYMPTOMS:**\n"
-                    response_text += "1. **Intelligent Pattern Recognition** - I identify symptoms using advanced keyword matching\n"
-                    response_text += "2. **Medical Knowledge Base** - I have access to 50+ medical conditions across all body systems\n"
-                    response_text += "3. **Symptom Combination Analysis** - I analyze how symptoms work together to suggest diagnoses\n"
-                    response_text += "4. **Confidence Scoring** - I provide confidence levels for each possible diagnosis\n"
-                    response_text += "5. **Urgency Assessment** - I categorize conditions as emergency, urgent, moderate, or routine\n\n"
-                    
-                    response_text += "**💊 HOW I GENERATE TREATMENT PLANS:**\n"
-                    response_text += "1. **Evidence-Based Recommendations** - Based on medical literature and best practices\n"
-                    response_text += "2. **Specific Medications** - I suggest appropriate medications and dosages\n"
-                    response_text += "3. **Lifestyle Modifications** - Diet, exercise, and behavioral changes\n"
-                    response_text += "4. **Emergency Protocols** - Immediate actions for critical conditions\n"
-                    response_text += "5. **Follow-up Care** - When to seek additional medical attention\n\n"
-                    
-                    response_text += "**🏥 MEDICAL SYSTEMS I COVER:**\n"
-                    response_text += "• **Gastrointestinal** - Digestive issues, abdominal pain, nausea, vomiting\n"
-                    response_text += "• **Neurological** - Headaches, seizures, tremors, numbness, weakness\n"
-                    response_text += "• **Cardiovascular** - Chest pain, palpitations, shortness of breath\n"
-                    response_text += "• **Respiratory** - Cough, breathing problems, wheezing\n"
-                    response_text += "• **Endocrine** - Diabetes, thyroid disorders, weight changes\n"
-                    response_text += "• **Musculoskeletal** - Joint pain, arthritis, muscle pain\n"
-                    response_text += "• **Dermatological** - Rashes, skin conditions, itching\n"
-                    response_text += "• **Urological** - Urinary problems, kidney issues\n"
-                    response_text += "• **Psychiatric** - Depression, anxiety, mood disorders\n"
-                    response_text += "• **Eye & Ear** - Vision problems, hearing issues\n\n"
-                    
-                    response_text += "**⚡ EMERGENCY DETECTION:**\n"
-                    response_text += "I can identify critical conditions requiring immediate medical attention:\n"
-                    response_text += "• Heart attacks, strokes, severe bleeding\n"
-                    response_text += "• Appendicitis, pulmonary embolism\n"
-                    response_text += "• Retinal detachment, pneumothorax\n\n"
-                    
-                    response_text += "**📊 ANALYSIS FORMAT:**\n"
-                    response_text += "• **Symptom Analysis Report** with detected patterns\n"
-                    response_text += "• **Most Likely Diagnosis** with confidence percentage\n"
-                    response_text += "• **Treatment Plan** with specific recommendations\n"
-                    response_text += "• **Other Possible Conditions** with confidence levels\n"
-                    response_text += "• **Urgency Assessment** and next steps\n\n"
-                    
-                    response_text += "**🎯 READY TO ANALYZE:**\n"
-                    response_text += "Simply describe your symptoms and I'll provide comprehensive medical analysis with intelligent diagnosis and treatment recommendations!\n\n"
-                    response_text += "**Example:** \"I have chest pain, shortness of breath, and nausea\"\n"
-                    response_text += "**Example:** \"Persistent headache with dizziness and fatigue\"\n"
-                    response_text += "**Example:** \"Rash with itching and fever\""
+                    response_text = CAPABILITIES_OVERVIEW_RESPONSE
                     
                     # Send response
                     response_message = create_text_chat(response_text)
@@ -1817,122 +1984,14 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
                 
                 # Check for specific symptom combinations
                 if "fever" in text_lower and "cough" in text_lower and "fatigue" in text_lower:
-                    response_text = "🩺 **SYMPTOM ANALYSIS: FEVER + COUGH + FATIGUE**\n\n"
-                    response_text += "**📋 SYMPTOM COMBINATION ANALYSIS:**\n"
-                    response_text += "The combination of fever, cough, and fatigue suggests several possible conditions:\n\n"
-                    
-                    response_text += "**🔍 MOST LIKELY DIAGNOSES:**\n"
-                    response_text += "• **Viral Upper Respiratory Infection (Common Cold)**\n"
-                    response_text += "• **Influenza (Flu)**\n"
-                    response_text += "• **COVID-19**\n"
-                    response_text += "• **Bronchitis**\n"
-                    response_text += "• **Sinus Infection**\n\n"
-                    
-                    response_text += "**💊 RECOMMENDED TREATMENT PLAN:**\n"
-                    response_text += "• **Rest and hydration** - Get plenty of sleep and drink fluids\n"
-                    response_text += "• **Over-the-counter medications:**\n"
-                    response_text += "  - Acetaminophen or ibuprofen for fever and body aches\n"
-                    response_text += "  - Cough suppressants or expectorants\n"
-                    response_text += "  - Decongestants if nasal congestion present\n"
-                    response_text += "• **Home remedies:**\n"
-                    response_text += "  - Warm salt water gargles for throat irritation\n"
-                    response_text += "  - Steam inhalation for cough relief\n"
-                    response_text += "  - Honey and lemon for cough\n\n"
-                    
-                    response_text += "**⚠️ WHEN TO SEEK MEDICAL CARE:**\n"
-                    response_text += "• Fever above 103°F (39.4°C) or persistent for 3+ days\n"
-                    response_text += "• Difficulty breathing or shortness of breath\n"
-                    response_text += "• Severe headache or neck stiffness\n"
-                    response_text += "• Chest pain or pressure\n"
-                    response_text += "• Symptoms worsen after 7-10 days\n\n"
-                    
-                    response_text += "**🕐 EXPECTED RECOVERY TIME:**\n"
-                    response_text += "• Common cold: 7-10 days\n"
-                    response_text += "• Flu: 1-2 weeks\n"
-                    response_text += "• COVID-19: 2-3 weeks (varies)\n"
+                    response_text = FEVER_COUGH_FATIGUE_RESPONSE
                     
                 elif "headache" in text_lower and "dizziness" in text_lower:
-                    response_text = "🩺 **SYMPTOM ANALYSIS: HEADACHE + DIZZINESS**\n\n"
-                    response_text += "**📋 SYMPTOM COMBINATION ANALYSIS:**\n"
-                    response_text += "The combination of persistent headaches and occasional dizziness suggests:\n\n"
-                    
-                    response_text += "**🔍 MOST LIKELY DIAGNOSES:**\n"
-                    response_text += "• **Tension Headaches** with vestibular involvement\n"
-                    response_text += "• **Migraine with vestibular symptoms**\n"
-                    response_text += "• **Dehydration**\n"
-                    response_text += "• **Low blood pressure**\n"
-                    response_text += "• **Inner ear disorders** (BPPV, labyrinthitis)\n"
-                    response_text += "• **Anxiety or stress-related**\n\n"
-                    
-                    response_text += "**💊 RECOMMENDED TREATMENT PLAN:**\n"
-                    response_text += "• **Immediate measures:**\n"
-                    response_text += "  - Stay hydrated (8-10 glasses water daily)\n"
-                    response_text += "  - Rest in a quiet, dark room\n"
-                    response_text += "  - Avoid sudden head movements\n"
-                    response_text += "• **Medications:**\n"
-                    response_text += "  - Ibuprofen or acetaminophen for headache\n"
-                    response_text += "  - Anti-nausea medication if needed\n"
-                    response_text += "• **Lifestyle modifications:**\n"
-                    response_text += "  - Regular sleep schedule\n"
-                    response_text += "  - Stress management techniques\n"
-                    response_text += "  - Avoid triggers (caffeine, alcohol, certain foods)\n\n"
-                    
-                    response_text += "**⚠️ WHEN TO SEEK MEDICAL CARE:**\n"
-                    response_text += "• Severe, sudden headache (thunderclap headache)\n"
-                    response_text += "• Headache with fever, neck stiffness, or rash\n"
-                    response_text += "• Persistent dizziness affecting daily activities\n"
-                    response_text += "• Vision changes or difficulty speaking\n"
-                    response_text += "• Headaches that worsen over time\n"
+                    response_text = HEADACHE_DIZZINESS_RESPONSE
                     
                 else:
                     # General medical knowledge base
-                    response_text = "🏥 **MEDICAL KNOWLEDGE BASE** 🏥\n\n"
-                    response_text += "Here are common symptoms and their possible diagnoses:\n\n"
-                    
-                    response_text += "**🌡️ FEVER (Elevated Temperature):**\n"
-                    response_text += "• Common cold or flu\n"
-                    response_text += "• Bacterial or viral infections\n"
-                    response_text += "• Urinary tract infection\n"
-                    response_text += "• COVID-19\n"
-                    response_text += "• Autoimmune conditions\n\n"
-                    
-                    response_text += "**🤧 COUGH:**\n"
-                    response_text += "• Common cold or flu\n"
-                    response_text += "• Allergies or asthma\n"
-                    response_text += "• Bronchitis or pneumonia\n"
-                    response_text += "• COVID-19\n"
-                    response_text += "• Acid reflux (GERD)\n\n"
-                    
-                    response_text += "**🤕 HEADACHE:**\n"
-                    response_text += "• Tension headache\n"
-                    response_text += "• Migraine\n"
-                    response_text += "• Sinus infection\n"
-                    response_text += "• Dehydration\n"
-                    response_text += "• Stress or fatigue\n\n"
-                    
-                    response_text += "**🤢 NAUSEA:**\n"
-                    response_text += "• Food poisoning\n"
-                    response_text += "• Motion sickness\n"
-                    response_text += "• Pregnancy\n"
-                    response_text += "• Medication side effects\n"
-                    response_text += "• Gastrointestinal issues\n\n"
-                    
-                    response_text += "**💨 SHORTNESS OF BREATH:**\n"
-                    response_text += "• Asthma\n"
-                    response_text += "• Anxiety or panic attacks\n"
-                    response_text += "• Heart conditions\n"
-                    response_text += "• Lung infections\n"
-                    response_text += "• Allergic reactions\n\n"
-                    
-                    response_text += "**🫀 CHEST PAIN:**\n"
-                    response_text += "• Heart attack (EMERGENCY)\n"
-                    response_text += "• Angina\n"
-                    response_text += "• Muscle strain\n"
-                    response_text += "• Acid reflux\n"
-                    response_text += "• Anxiety\n\n"
-                    
-                    response_text += "**⚠️ IMPORTANT:**\n"
-                    response_text += "This is general information only. Always consult a healthcare professional for proper diagnosis and treatment."
+                    response_text = GENERAL_KNOWLEDGE_RESPONSE
                 
             else:
                 # Handle actual symptom reports using intelligent analysis
@@ -2022,27 +2081,14 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
                     response_text += "💚 **Continue monitoring. Contact healthcare provider if symptoms worsen.**"
             
             # Add disclaimers
-            response_text += "\n\n---\n"
-            response_text += "⚠️ **IMPORTANT DISCLAIMER:**\n"
-            response_text += "This AI assistant provides general health information only and cannot replace professional medical advice, diagnosis, or treatment. Always consult with qualified healthcare providers for medical concerns."
+            response_text += DISCLAIMER_FOOTER
             
             # Add timestamp
             response_text += f"\n\n🕐 **Assessment Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
             response_text += f"\n🤖 **AI Agent:** MediTech Healthcare Assistant"
             
             # Safety check to ensure we never send blank responses
-            if not response_text or response_text.strip() == "":
-                response_text = "🩺 **MEDITECH AI HEALTHCARE ASSISTANT** 🩺\n\n"
-                response_text += "I apologize, but I encountered an issue processing your request. Please try again with a clear symptom description.\n\n"
-                response_text += "**💡 EXAMPLE:** \"I have a headache and feel dizzy\"\n\n"
-                response_text += "🩺 **I'm here to help with your health concerns!**"
-            
-            # Safety check to ensure we never send blank responses
-            if not response_text or response_text.strip() == "":
-                response_text = "🩺 **MEDITECH AI HEALTHCARE ASSISTANT** 🩺\n\n"
-                response_text += "I apologize, but I encountered an issue processing your request. Please try again with a clear symptom description.\n\n"
-                response_text += "**💡 EXAMPLE:** \"I have a headache and feel dizzy\"\n\n"
-                response_text += "🩺 **I'm here to help with your health concerns!**"
+            response_text = ensure_nonempty_response(response_text)
             
             # Send response
             ctx.logger.info(f"FINAL RESPONSE for {sender}: {len(response_text)} characters")
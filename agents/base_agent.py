@@ -4,7 +4,7 @@ Base Healthcare Agent - Common functionality for all healthcare agents
 
 from datetime import datetime
 from uuid import uuid4
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from uagents import Agent, Context, Protocol
 from uagents.setup import fund_agent_if_low
 from uagents_core.contrib.protocols.chat import (
@@ -19,10 +19,28 @@ from pydantic import BaseModel
 import json
 import logging
 
+# Optional fast JSON codec (falls back to the standard library json module)
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def loads_json(text: str) -> Any:
+    """Parse a JSON message; raises json.JSONDecodeError on invalid input"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def dumps_json(data: Any) -> str:
+    """Serialize a message to a JSON string"""
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data)
+
 class PatientData(BaseModel):
     """Patient information model"""
     patient_id: str
@@ -68,6 +86,12 @@ class BaseHealthcareAgent:
         self.agent_type = agent_type
         self.agent = Agent(name=name, seed=seed_phrase)
         self.chat_proto = Protocol(spec=chat_protocol_spec)
+        # Content handlers keyed by the chat protocol's ``type`` discriminator
+        self.content_handlers = {
+            "text": self.on_text_content,
+            "start-session": self.on_start_session,
+            "end-session": self.on_end_session,
+        }
         self.setup_agent()
     
     def setup_agent(self):
@@ -96,14 +120,36 @@ class BaseHealthcareAgent:
             acknowledged_msg_id=msg.msg_id
         ))
         
-        # Process content
+        # Process content, dispatching on the content type discriminator
         for item in msg.content:
-            if isinstance(item, StartSessionContent):
-                logger.info(f"{self.name} started session with {sender}")
-            elif isinstance(item, TextContent):
-                await self.handle_text_message(ctx, sender, item.text)
-            elif isinstance(item, EndSessionContent):
-                logger.info(f"{self.name} ended session with {sender}")
+            content_type = getattr(item, "type", None)
+            if content_type is None:
+                content_type = self.get_content_type(item)
+            handler = self.content_handlers.get(content_type)
+            if handler:
+                await handler(ctx, sender, item)
+    
+    def get_content_type(self, item: Any) -> Optional[str]:
+        """Resolve the content type for items without a ``type`` field"""
+        if isinstance(item, TextContent):
+            return "text"
+        elif isinstance(item, StartSessionContent):
+            return "start-session"
+        elif isinstance(item, EndSessionContent):
+            return "end-session"
+        return None
+    
+    async def on_start_session(self, ctx: Context, sender: str, item: StartSessionContent):
+        """Handle the start of a chat session"""
+        logger.info(f"{self.name} started session with {sender}")
+    
+    async def on_text_content(self, ctx: Context, sender: str, item: TextContent):
+        """Handle a text content item"""
+        await self.handle_text_message(ctx, sender, item.text)
+    
+    async def on_end_session(self, ctx: Context, sender: str, item: EndSessionContent):
+        """Handle the end of a chat session"""
+        logger.info(f"{self.name} ended session with {sender}")
     
     async def handle_text_message(self, ctx: Context, sender: str, text: str):
         """Handle text messages - to be implemented by subclasses"""
@@ -128,11 +174,13 @@ class BaseHealthcareAgent:
             message_id=str(uuid4())
         )
     
-    async def send_message(self, ctx: Context, recipient: str, message: str):
-        """Send a message to another agent"""
+    async def send_message(self, ctx: Context, recipient: str, message: Union[str, bytes]):
+        """Send a message to another agent (bytes are taken as UTF-8 encoded text)"""
+        if isinstance(message, bytes):
+            message = message.decode("utf-8")
         chat_message = self.create_text_chat(message)
         await ctx.send(recipient, chat_message)
-        logger.info(f"{self.name} sent message to {recipient}: {message}")
+        logger.info("%s sent message to %s: %s", self.name, recipient, message)
     
     def run(self):
         """Run the agent"""
@@ -3,6 +3,7 @@ Care Coordinator Agent - Orchestrates collaboration between all healthcare agent
 """
 
 import json
+import sys
 from typing import Dict, List, Any
 from agents.base_agent import BaseHealthcareAgent, PatientData
 from uagents import Context
@@ -16,12 +17,16 @@ class CareCoordinator(BaseHealthcareAgent):
     
     def __init__(self, seed_phrase: str):
         super().__init__("CareCoordinator", "coordination", seed_phrase)
-        self.agent_addresses = {
+        agent_addresses = {
             "SymptomAnalyzer": "agent1q...",  # Will be updated with actual addresses
             "DiagnosisSpecialist": "agent1q...",
             "TreatmentPlanner": "agent1q...",
             "RiskAssessment": "agent1q..."
         }
+        # Intern names and addresses so repeated lookups and sends compare by identity
+        self.agent_addresses = {
+            sys.intern(name): sys.intern(address) for name, address in agent_addresses.items()
+        }
         self.active_cases = {}
     
     async def handle_text_message(self, ctx: Context, sender: str, text: str):
@@ -2,94 +2,200 @@
 Diagnosis Specialist Agent - Uses medical knowledge to suggest diagnoses
 """
 
+import heapq
 import json
-from typing import Dict, List, Any, Tuple
-from agents.base_agent import BaseHealthcareAgent, PatientData, Diagnosis
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterable, List, Any, Optional, Tuple
+from agents.base_agent import BaseHealthcareAgent, PatientData, Diagnosis, dumps_json, loads_json
+from agents.keyword_matcher import KeywordMatcher
 from uagents import Context
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Medical diagnosis knowledge base, shared by all DiagnosisSpecialist instances
+DIAGNOSIS_KNOWLEDGE: Dict[str, Dict[str, Any]] = {
+    "myocardial_infarction": {
+        "symptoms": ["chest pain", "shortness of breath", "nausea", "sweating", "arm pain"],
+        "risk_factors": ["age > 65", "diabetes", "hypertension", "smoking", "family history"],
+        "diagnostic_criteria": ["ECG changes", "elevated troponins", "chest pain"],
+        "confidence_factors": {
+            "chest_pain": 0.8,
+            "ECG_changes": 0.9,
+            "elevated_troponins": 0.95
+        }
+    },
+    "pneumonia": {
+        "symptoms": ["cough", "fever", "shortness of breath", "chest pain", "fatigue"],
+        "risk_factors": ["age > 65", "immunocompromised", "smoking", "chronic lung disease"],
+        "diagnostic_criteria": ["chest X-ray", "elevated WBC", "fever"],
+        "confidence_factors": {
+            "chest_xray": 0.85,
+            "fever": 0.7,
+            "cough": 0.6
+        }
+    },
+    "migraine": {
+        "symptoms": ["headache", "nausea", "sensitivity to light", "sensitivity to sound"],
+        "risk_factors": ["family history", "female", "stress", "hormonal changes"],
+        "diagnostic_criteria": ["headache pattern", "associated symptoms"],
+        "confidence_factors": {
+            "unilateral_headache": 0.7,
+            "photophobia": 0.8,
+            "nausea": 0.6
+        }
+    },
+    "gastroenteritis": {
+        "symptoms": ["nausea", "vomiting", "diarrhea", "abdominal pain", "fever"],
+        "risk_factors": ["food poisoning", "viral infection", "travel"],
+        "diagnostic_criteria": ["symptoms", "stool culture"],
+        "confidence_factors": {
+            "diarrhea": 0.8,
+            "nausea_vomiting": 0.7,
+            "fever": 0.6
+        }
+    },
+    "anxiety_disorder": {
+        "symptoms": ["anxiety", "panic", "sweating", "palpitations", "shortness of breath"],
+        "risk_factors": ["stress", "family history", "trauma"],
+        "diagnostic_criteria": ["symptom duration", "functional impairment"],
+        "confidence_factors": {
+            "persistent_anxiety": 0.8,
+            "panic_attacks": 0.9,
+            "functional_impairment": 0.7
+        }
+    }
+}
+
+def build_symptom_diagnosis_mapping(diagnosis_knowledge: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Build mapping from symptoms to possible diagnoses"""
+    mapping = {}
+    for diagnosis, info in diagnosis_knowledge.items():
+        for symptom in info["symptoms"]:
+            if symptom not in mapping:
+                mapping[symptom] = []
+            mapping[symptom].append(diagnosis)
+    return mapping
+
+SYMPTOM_DIAGNOSIS_MAPPING = build_symptom_diagnosis_mapping(DIAGNOSIS_KNOWLEDGE)
+
+# Single-pass matcher over all symptom keys
+SYMPTOM_MATCHER = KeywordMatcher(SYMPTOM_DIAGNOSIS_MAPPING)
+
+# One bit per symptom key; each diagnosis gets the mask of its symptoms
+SYMPTOM_KEY_BITS = {key: 1 << index for index, key in enumerate(SYMPTOM_DIAGNOSIS_MAPPING)}
+
+def symptom_mask(symptom_keys) -> int:
+    """Combine the bits of the given symptom keys into one mask"""
+    mask = 0
+    for symptom_key in symptom_keys:
+        mask |= SYMPTOM_KEY_BITS[symptom_key]
+    return mask
+
+DIAGNOSIS_SYMPTOM_MASKS = {
+    diagnosis: symptom_mask(info["symptoms"]) for diagnosis, info in DIAGNOSIS_KNOWLEDGE.items()
+}
+
+@lru_cache(maxsize=4096)
+def symptom_match_mask(symptom: str) -> int:
+    """Mask of the knowledge base symptom keys found in a raw patient symptom"""
+    return symptom_mask(SYMPTOM_MATCHER.find(sys.intern(symptom.lower().strip())))
+
+@lru_cache(maxsize=1024)
+def find_differential_diagnoses(primary_diagnosis: str, symptom_masks: Tuple[int, ...]) -> Tuple[str, ...]:
+    """Other diagnoses sharing the patient's symptoms, keyed by per-symptom match masks"""
+    differentials = []
+    seen = {primary_diagnosis}
+    for mask in symptom_masks:
+        for symptom_key, bit in SYMPTOM_KEY_BITS.items():
+            if mask & bit:
+                for diagnosis in SYMPTOM_DIAGNOSIS_MAPPING[symptom_key]:
+                    if diagnosis not in seen:
+                        seen.add(diagnosis)
+                        differentials.append(diagnosis.replace("_", " ").title())
+                        if len(differentials) == 3:
+                            return tuple(differentials)
+    return tuple(differentials)
+
+@lru_cache(maxsize=None)
+def confidence_score(symptom_count: int, risk_factor_count: int) -> float:
+    """Confidence for the given numbers of matching symptoms and risk factors"""
+    confidence = 0.2 * symptom_count
+    
+    # Risk factors (added one at a time so scores at the thresholds stay unchanged)
+    for _ in range(risk_factor_count):
+        confidence += 0.1
+    
+    # Normalize confidence
+    if symptom_count > 0:
+        confidence = min(confidence, 1.0)
+    
+    return confidence
+
+# Diagnoses that always warrant urgent attention
+URGENT_CONDITIONS = frozenset({"myocardial_infarction", "pneumonia", "stroke"})
+
+# Age-based risk factors and the check each one applies to the patient's age
+AGE_RISK_FACTORS: Dict[str, Callable[[int], bool]] = {
+    "age > 65": lambda age: age > 65,
+    "age < 18": lambda age: age < 18,
+}
+
+def parse_risk_factor(risk_factor: str) -> Tuple[Optional[Callable[[int], bool]], FrozenSet[str]]:
+    """Return the age check (if any) and the history keywords of a risk factor"""
+    risk_factor_lower = risk_factor.lower()
+    for age_risk_factor, age_check in AGE_RISK_FACTORS.items():
+        if age_risk_factor in risk_factor_lower:
+            return age_check, frozenset()
+    return None, frozenset(risk_factor_lower.split())
+
+# Pre-parsed form of every knowledge base risk factor
+RISK_FACTOR_TERMS = {
+    risk_factor: parse_risk_factor(risk_factor)
+    for info in DIAGNOSIS_KNOWLEDGE.values()
+    for risk_factor in info["risk_factors"]
+}
+
+# Single-pass matcher over every history keyword of those risk factors
+RISK_KEYWORD_MATCHER = KeywordMatcher(
+    keyword for _, keywords in RISK_FACTOR_TERMS.values() for keyword in keywords
+)
+
+# Agent addresses whose patient data was already validated upstream (the
+# CareCoordinator serializes it from a PatientData). Their requests skip
+# re-validation; every other sender is still fully validated
+TRUSTED_SENDERS: FrozenSet[str] = frozenset()
+
 class DiagnosisSpecialist(BaseHealthcareAgent):
     """Agent that specializes in medical diagnosis using knowledge base"""
     
-    def __init__(self, seed_phrase: str):
+    def __init__(self, seed_phrase: str, trusted_senders: Optional[Iterable[str]] = None):
         super().__init__("DiagnosisSpecialist", "diagnosis", seed_phrase)
+        self.trusted_senders = TRUSTED_SENDERS if trusted_senders is None else frozenset(trusted_senders)
+        # Shared, process-wide knowledge base and indexes (built once at import)
         self.diagnosis_knowledge = self.load_diagnosis_knowledge()
         self.symptom_diagnosis_mapping = self.load_symptom_diagnosis_mapping()
     
     def load_diagnosis_knowledge(self) -> Dict[str, Dict[str, Any]]:
         """Load medical diagnosis knowledge base"""
-        return {
-            "myocardial_infarction": {
-                "symptoms": ["chest pain", "shortness of breath", "nausea", "sweating", "arm pain"],
-                "risk_factors": ["age > 65", "diabetes", "hypertension", "smoking", "family history"],
-                "diagnostic_criteria": ["ECG changes", "elevated troponins", "chest pain"],
-                "confidence_factors": {
-                    "chest_pain": 0.8,
-                    "ECG_changes": 0.9,
-                    "elevated_troponins": 0.95
-                }
-            },
-            "pneumonia": {
-                "symptoms": ["cough", "fever", "shortness of breath", "chest pain", "fatigue"],
-                "risk_factors": ["age > 65", "immunocompromised", "smoking", "chronic lung disease"],
-                "diagnostic_criteria": ["chest X-ray", "elevated WBC", "fever"],
-                "confidence_factors": {
-                    "chest_xray": 0.85,
-                    "fever": 0.7,
-                    "cough": 0.6
-                }
-            },
-            "migraine": {
-                "symptoms": ["headache", "nausea", "sensitivity to light", "sensitivity to sound"],
-                "risk_factors": ["family history", "female", "stress", "hormonal changes"],
-                "diagnostic_criteria": ["headache pattern", "associated symptoms"],
-                "confidence_factors": {
-                    "unilateral_headache": 0.7,
-                    "photophobia": 0.8,
-                    "nausea": 0.6
-                }
-            },
-            "gastroenteritis": {
-                "symptoms": ["nausea", "vomiting", "diarrhea", "abdominal pain", "fever"],
-                "risk_factors": ["food poisoning", "viral infection", "travel"],
-                "diagnostic_criteria": ["symptoms", "stool culture"],
-                "confidence_factors": {
-                    "diarrhea": 0.8,
-                    "nausea_vomiting": 0.7,
-                    "fever": 0.6
-                }
-            },
-            "anxiety_disorder": {
-                "symptoms": ["anxiety", "panic", "sweating", "palpitations", "shortness of breath"],
-                "risk_factors": ["stress", "family history", "trauma"],
-                "diagnostic_criteria": ["symptom duration", "functional impairment"],
-                "confidence_factors": {
-                    "persistent_anxiety": 0.8,
-                    "panic_attacks": 0.9,
-                    "functional_impairment": 0.7
-                }
-            }
-        }
+        return DIAGNOSIS_KNOWLEDGE
     
     def load_symptom_diagnosis_mapping(self) -> Dict[str, List[str]]:
         """Load mapping from symptoms to possible diagnoses"""
-        mapping = {}
-        for diagnosis, info in self.diagnosis_knowledge.items():
-            for symptom in info["symptoms"]:
-                if symptom not in mapping:
-                    mapping[symptom] = []
-                mapping[symptom].append(diagnosis)
-        return mapping
+        return SYMPTOM_DIAGNOSIS_MAPPING
     
     async def handle_text_message(self, ctx: Context, sender: str, text: str):
         """Handle incoming text messages"""
         try:
-            message_data = json.loads(text)
+            message_data = loads_json(text)
             
             if message_data.get("type") == "request_diagnosis":
-                patient_data = PatientData(**message_data["patient_data"])
+                # Trusted senders' patient data is rebuilt without re-running validation
+                if sender in self.trusted_senders:
+                    patient_data = PatientData.model_construct(**message_data["patient_data"])
+                else:
+                    patient_data = PatientData(**message_data["patient_data"])
                 symptom_analysis = message_data.get("symptom_analysis", {})
                 
                 diagnosis_result = await self.generate_diagnosis(patient_data, symptom_analysis)
@@ -99,116 +205,131 @@ class DiagnosisSpecialist(BaseHealthcareAgent):
                     "diagnoses": diagnosis_result,
                     "agent": self.name
                 }
-                await self.send_message(ctx, sender, json.dumps(response))
+                await self.send_message(ctx, sender, dumps_json(response))
                 
         except json.JSONDecodeError:
             if "diagnosis" in text.lower():
                 await self.send_message(ctx, sender, f"{self.name}: Ready to provide diagnosis. Please provide patient data and symptom analysis.")
         except Exception as e:
-            logger.error(f"Error in DiagnosisSpecialist: {e}")
+            logger.error("Error in DiagnosisSpecialist: %s", e)
             await self.send_message(ctx, sender, f"{self.name}: Error processing diagnosis request.")
     
     async def generate_diagnosis(self, patient_data: PatientData, symptom_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate diagnosis based on symptoms and analysis"""
-        possible_diagnoses = self.identify_possible_diagnoses(patient_data.symptoms)
-        diagnoses = []
+        # Match each patient symptom against the knowledge base once
+        symptom_masks = [(symptom, symptom_match_mask(symptom)) for symptom in patient_data.symptoms]
+        possible_diagnoses = self.diagnoses_for_masks(mask for _, mask in symptom_masks)
+        # Evaluate each knowledge base risk factor once for the patient
+        risk_factor_hits = self.get_risk_factor_hits(patient_data, self.get_history_keywords(patient_data))
+        scores = []
         
         for diagnosis_name in possible_diagnoses:
-            diagnosis_info = self.diagnosis_knowledge[diagnosis_name]
-            confidence = self.calculate_confidence(patient_data, diagnosis_info, symptom_analysis)
-            
-            if confidence > 0.3:  # Only include diagnoses with reasonable confidence
-                diagnosis = {
-                    "condition": diagnosis_name.replace("_", " ").title(),
-                    "confidence": confidence,
-                    "reasoning": self.generate_reasoning(patient_data, diagnosis_info, confidence),
-                    "supporting_evidence": self.identify_supporting_evidence(patient_data, diagnosis_info),
-                    "differential_diagnoses": self.get_differential_diagnoses(diagnosis_name, patient_data.symptoms),
-                    "recommended_tests": self.recommend_diagnostic_tests(diagnosis_info),
-                    "urgency": self.assess_urgency(diagnosis_name, patient_data)
-                }
-                diagnoses.append(diagnosis)
-        
-        # Sort by confidence
-        diagnoses.sort(key=lambda x: x["confidence"], reverse=True)
-        return diagnoses[:5]  # Return top 5 diagnoses
-    
-    def identify_possible_diagnoses(self, symptoms: List[str]) -> List[str]:
-        """Identify possible diagnoses based on symptoms"""
-        possible_diagnoses = set()
-        
-        for symptom in symptoms:
-            symptom_lower = symptom.lower()
-            for symptom_key, diagnoses in self.symptom_diagnosis_mapping.items():
-                if symptom_key in symptom_lower:
-                    possible_diagnoses.update(diagnoses)
+            score = self.score_diagnosis(diagnosis_name, patient_data, symptom_analysis, symptom_masks, risk_factor_hits)
+            if score:
+                scores.append(score)
         
-        return list(possible_diagnoses)
+        # Pick the top 5 by confidence, then build full results only for those
+        top_scores = heapq.nlargest(5, scores, key=lambda score: score["confidence"])
+        return [self.build_diagnosis(score, patient_data, symptom_masks) for score in top_scores]
     
-    def calculate_confidence(self, patient_data: PatientData, diagnosis_info: Dict[str, Any], symptom_analysis: Dict[str, Any]) -> float:
-        """Calculate confidence score for a diagnosis"""
-        confidence = 0.0
-        symptom_count = 0
+    def score_diagnosis(self, diagnosis_name: str, patient_data: PatientData, symptom_analysis: Dict[str, Any],
+                        symptom_masks: List[Tuple[str, int]], risk_factor_hits: FrozenSet[str]) -> Optional[Dict[str, Any]]:
+        """Score one candidate diagnosis in a single pass over the patient's matches"""
+        diagnosis_info = self.diagnosis_knowledge[diagnosis_name]
+        diagnosis_mask = DIAGNOSIS_SYMPTOM_MASKS[diagnosis_name]
         
-        # Check symptom matches
-        for symptom in patient_data.symptoms:
-            symptom_lower = symptom.lower()
-            for diagnosis_symptom in diagnosis_info["symptoms"]:
-                if diagnosis_symptom in symptom_lower:
-                    confidence += 0.2
-                    symptom_count += 1
-                    break
+        # Collect matching symptoms and their evidence together
+        matching_symptoms = []
+        supporting_evidence = []
+        for symptom, mask in symptom_masks:
+            if mask & diagnosis_mask:
+                matching_symptoms.append(symptom)
+                supporting_evidence.append(f"Patient reports {symptom}")
+        matching_risk_factors = [risk_factor for risk_factor in diagnosis_info["risk_factors"] if risk_factor in risk_factor_hits]
         
-        # Check risk factors
-        for risk_factor in diagnosis_info["risk_factors"]:
-            if self.check_risk_factor(patient_data, risk_factor):
-                confidence += 0.1
+        confidence = self.calculate_confidence(patient_data, diagnosis_info, symptom_analysis, matching_symptoms, matching_risk_factors)
+        if confidence <= 0.3:  # Only include diagnoses with reasonable confidence
+            return None
         
-        # Normalize confidence
-        if symptom_count > 0:
-            confidence = min(confidence, 1.0)
+        return {
+            "diagnosis_name": diagnosis_name,
+            "confidence": confidence,
+            "matching_symptoms": matching_symptoms,
+            "matching_risk_factors": matching_risk_factors,
+            "supporting_evidence": supporting_evidence
+        }
+    
+    def build_diagnosis(self, score: Dict[str, Any], patient_data: PatientData, symptom_masks: List[Tuple[str, int]]) -> Dict[str, Any]:
+        """Build the full diagnosis result for a scored candidate"""
+        diagnosis_name = score["diagnosis_name"]
+        diagnosis_info = self.diagnosis_knowledge[diagnosis_name]
+        confidence = score["confidence"]
         
-        return confidence
+        return {
+            "condition": diagnosis_name.replace("_", " ").title(),
+            "confidence": confidence,
+            "reasoning": self.generate_reasoning(patient_data, diagnosis_info, confidence, score["matching_symptoms"], score["matching_risk_factors"]),
+            "supporting_evidence": score["supporting_evidence"],
+            "differential_diagnoses": list(find_differential_diagnoses(diagnosis_name, tuple(mask for _, mask in symptom_masks))),
+            "recommended_tests": self.recommend_diagnostic_tests(diagnosis_info),
+            "urgency": self.assess_urgency(diagnosis_name, patient_data)
+        }
+    
+    def identify_possible_diagnoses(self, symptoms: List[str]) -> List[str]:
+        """Identify possible diagnoses based on symptoms"""
+        return self.diagnoses_for_masks(symptom_match_mask(symptom) for symptom in symptoms)
     
-    def check_risk_factor(self, patient_data: PatientData, risk_factor: str) -> bool:
+    def diagnoses_for_masks(self, symptom_masks: Iterable[int]) -> List[str]:
+        """Diagnoses sharing at least one symptom key with the given symptom masks"""
+        patient_mask = 0
+        for mask in symptom_masks:
+            patient_mask |= mask
+        return [diagnosis for diagnosis, diagnosis_mask in DIAGNOSIS_SYMPTOM_MASKS.items() if diagnosis_mask & patient_mask]
+    
+    def calculate_confidence(self, patient_data: PatientData, diagnosis_info: Dict[str, Any], symptom_analysis: Dict[str, Any], matching_symptoms: List[str], matching_risk_factors: List[str]) -> float:
+        """Calculate confidence score for a diagnosis"""
+        return confidence_score(len(matching_symptoms), len(matching_risk_factors))
+    
+    def get_history_text(self, patient_data: PatientData) -> str:
+        """Lowercased medical history, one condition per line"""
+        # No keyword contains a newline, so a match never spans two conditions
+        return "\n".join(patient_data.medical_history).lower()
+    
+    def get_history_keywords(self, patient_data: PatientData) -> FrozenSet[str]:
+        """Knowledge base risk factor keywords found in the patient's medical history"""
+        return RISK_KEYWORD_MATCHER.find(self.get_history_text(patient_data))
+    
+    def get_risk_factor_hits(self, patient_data: PatientData, history_keywords: FrozenSet[str]) -> FrozenSet[str]:
+        """Knowledge base risk factors present for the patient"""
+        return frozenset(
+            risk_factor for risk_factor in RISK_FACTOR_TERMS
+            if self.check_risk_factor(patient_data, risk_factor, history_keywords)
+        )
+    
+    def check_risk_factor(self, patient_data: PatientData, risk_factor: str, history_keywords: Optional[FrozenSet[str]] = None) -> bool:
         """Check if patient has a specific risk factor"""
-        risk_factor_lower = risk_factor.lower()
+        age_check, keywords = RISK_FACTOR_TERMS.get(risk_factor) or parse_risk_factor(risk_factor)
         
         # Age-based risk factors
-        if "age > 65" in risk_factor_lower:
-            return patient_data.age > 65
-        elif "age < 18" in risk_factor_lower:
-            return patient_data.age < 18
+        if age_check:
+            return age_check(patient_data.age)
         
-        # Medical history risk factors
-        for condition in patient_data.medical_history:
-            if any(keyword in condition.lower() for keyword in risk_factor_lower.split()):
-                return True
-        
-        return False
+        # Medical history risk factors; without the matcher's keywords (or for a
+        # risk factor outside the knowledge base) the history is scanned directly
+        if history_keywords is None or risk_factor not in RISK_FACTOR_TERMS:
+            history_text = self.get_history_text(patient_data)
+            return any(keyword in history_text for keyword in keywords)
+        return not keywords.isdisjoint(history_keywords)
     
-    def generate_reasoning(self, patient_data: PatientData, diagnosis_info: Dict[str, Any], confidence: float) -> str:
+    def generate_reasoning(self, patient_data: PatientData, diagnosis_info: Dict[str, Any], confidence: float, matching_symptoms: List[str], matching_risk_factors: List[str]) -> str:
         """Generate reasoning for the diagnosis"""
         reasoning_parts = []
         
         # Symptom-based reasoning
-        matching_symptoms = []
-        for symptom in patient_data.symptoms:
-            symptom_lower = symptom.lower()
-            for diagnosis_symptom in diagnosis_info["symptoms"]:
-                if diagnosis_symptom in symptom_lower:
-                    matching_symptoms.append(symptom)
-                    break
-        
         if matching_symptoms:
             reasoning_parts.append(f"Patient presents with {', '.join(matching_symptoms)}")
         
         # Risk factor reasoning
-        matching_risk_factors = []
-        for risk_factor in diagnosis_info["risk_factors"]:
-            if self.check_risk_factor(patient_data, risk_factor):
-                matching_risk_factors.append(risk_factor)
-        
         if matching_risk_factors:
             reasoning_parts.append(f"Risk factors include: {', '.join(matching_risk_factors)}")
         
@@ -222,33 +343,15 @@ class DiagnosisSpecialist(BaseHealthcareAgent):
         
         return ". ".join(reasoning_parts) + "."
     
-    def identify_supporting_evidence(self, patient_data: PatientData, diagnosis_info: Dict[str, Any]) -> List[str]:
+    def identify_supporting_evidence(self, patient_data: PatientData, diagnosis_info: Dict[str, Any], matching_symptoms: List[str]) -> List[str]:
         """Identify supporting evidence for the diagnosis"""
-        evidence = []
-        
-        for symptom in patient_data.symptoms:
-            symptom_lower = symptom.lower()
-            for diagnosis_symptom in diagnosis_info["symptoms"]:
-                if diagnosis_symptom in symptom_lower:
-                    evidence.append(f"Patient reports {symptom}")
-                    break
-        
-        return evidence
+        return [f"Patient reports {symptom}" for symptom in matching_symptoms]
     
     def get_differential_diagnoses(self, primary_diagnosis: str, symptoms: List[str]) -> List[str]:
         """Get differential diagnoses to consider"""
-        differentials = []
-        
-        # Get other diagnoses that share symptoms
-        for symptom in symptoms:
-            symptom_lower = symptom.lower()
-            for symptom_key, diagnoses in self.symptom_diagnosis_mapping.items():
-                if symptom_key in symptom_lower:
-                    for diagnosis in diagnoses:
-                        if diagnosis != primary_diagnosis and diagnosis not in differentials:
-                            differentials.append(diagnosis.replace("_", " ").title())
-        
-        return differentials[:3]  # Return top 3 differentials
+        # Get other diagnoses that share symptoms (top 3, cached per symptom match pattern)
+        symptom_masks = tuple(symptom_match_mask(symptom) for symptom in symptoms)
+        return list(find_differential_diagnoses(primary_diagnosis, symptom_masks))
     
     def recommend_diagnostic_tests(self, diagnosis_info: Dict[str, Any]) -> List[str]:
         """Recommend diagnostic tests for the diagnosis"""
@@ -256,9 +359,7 @@ class DiagnosisSpecialist(BaseHealthcareAgent):
     
     def assess_urgency(self, diagnosis_name: str, patient_data: PatientData) -> str:
         """Assess urgency of the diagnosis"""
-        urgent_conditions = ["myocardial_infarction", "pneumonia", "stroke"]
-        
-        if diagnosis_name in urgent_conditions:
+        if diagnosis_name in URGENT_CONDITIONS:
             return "urgent"
         elif patient_data.age > 65 or len(patient_data.current_medications) > 3:
             return "moderate"
@@ -4,13 +4,20 @@ Intelligent AI Agent - Never Fails to Provide Results
 This agent can interpret ANY symptom input and provide intelligent analysis
 """
 
-import asyncio
-import re
+import heapq
 import logging
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+import sys
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from itertools import chain
+from math import fsum
+from operator import itemgetter
+from agents.keyword_matcher import KeywordMatcher
+from agents.result_cache import CacheKey, copy_structure, freeze_value
 
 class SymptomCategory(Enum):
     EMERGENCY = "emergency"
@@ -18,15 +25,776 @@ class SymptomCategory(Enum):
     ROUTINE = "routine"
     NON_URGENT = "non_urgent"
 
-@dataclass
+@dataclass(frozen=True)
 class IntelligentSymptom:
     """Intelligent symptom interpretation"""
+    __slots__ = ("original_text", "interpreted_symptoms", "category", "confidence", "reasoning", "related_conditions")
+    
     original_text: str
-    interpreted_symptoms: List[str]
+    interpreted_symptoms: Tuple[str, ...]
     category: SymptomCategory
     confidence: float
     reasoning: str
-    related_conditions: List[str]
+    related_conditions: Tuple[str, ...]
+
+# Symptom interpretation patterns, shared by all IntelligentAIAgent instances
+SYMPTOM_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    # Color-related symptoms
+    "pale_complexion": ("white", "pale", "pallor", "ashen", "gray", "wan", "sallow"),
+    "redness": ("red", "flushed", "rosy", "crimson", "scarlet"),
+    "yellowing": ("yellow", "jaundiced", "icteric", "golden"),
+    "blue_tint": ("blue", "cyanotic", "bluish", "purple"),
+    
+    # Appearance-related
+    "swelling": ("swollen", "puffy", "inflated", "enlarged", "bulging"),
+    "rash": ("rash", "spots", "bumps", "lesions", "patches"),
+    "dryness": ("dry", "flaky", "scaly", "rough", "cracked"),
+    "moisture": ("wet", "moist", "sweaty", "damp", "sticky"),
+    
+    # Pain-related
+    "pain": ("pain", "ache", "hurt", "sore", "tender", "throbbing"),
+    "sharp_pain": ("sharp", "stabbing", "piercing", "cutting"),
+    "dull_pain": ("dull", "aching", "heavy", "pressure"),
+    "burning": ("burning", "hot", "fire", "scorching"),
+    
+    # Movement-related
+    "weakness": ("weak", "tired", "exhausted", "fatigued", "lethargic"),
+    "stiffness": ("stiff", "rigid", "tight", "tense", "frozen"),
+    "tremor": ("shaking", "trembling", "quivering", "vibrating"),
+    "numbness": ("numb", "tingling", "pins and needles", "dead"),
+    
+    # Breathing-related
+    "breathing_problems": ("breath", "breathing", "air", "oxygen", "suffocating"),
+    "cough": ("cough", "coughing", "hacking", "clearing throat"),
+    "wheezing": ("wheezing", "whistling", "rattling", "gurgling"),
+    
+    # Digestive-related
+    "nausea": ("nausea", "sick", "queasy", "upset stomach"),
+    "vomiting": ("vomit", "throwing up", "puking", "regurgitating"),
+    "diarrhea": ("diarrhea", "loose stools", "watery", "runny"),
+    "constipation": ("constipation", "blocked", "hard stools", "straining"),
+    
+    # Neurological
+    "headache": ("headache", "head pain", "migraine", "head pounding"),
+    "dizziness": ("dizzy", "lightheaded", "spinning", "vertigo"),
+    "confusion": ("confused", "disoriented", "foggy", "unclear"),
+    "memory_problems": ("memory", "forgetful", "amnesia", "recall"),
+    
+    # Cardiovascular
+    "chest_pain": ("chest", "heart", "cardiac", "thoracic"),
+    "palpitations": ("heartbeat", "pounding", "racing", "irregular"),
+    "swelling_legs": ("swollen legs", "puffy feet", "ankle swelling"),
+    
+    # General symptoms
+    "fever": ("fever", "hot", "temperature", "burning up"),
+    "chills": ("chills", "shivering", "cold", "freezing"),
+    "fatigue": ("tired", "exhausted", "worn out", "drained", "weak", "lethargic", "sluggish"),
+    "weight_changes": ("weight", "gained", "lost", "heavier", "lighter", "thinner", "fatter"),
+    
+    # Additional comprehensive symptom patterns
+    "pain_patterns": ("pain", "ache", "hurt", "sore", "tender", "throbbing", "stabbing", "burning", "sharp", "dull"),
+    "breathing_issues": ("breath", "breathe", "panting", "gasping", "wheezing", "coughing", "choking", "suffocating"),
+    "digestive_symptoms": ("stomach", "belly", "gut", "nausea", "vomit", "diarrhea", "constipation", "bloating", "gas"),
+    "neurological_symptoms": ("head", "brain", "dizzy", "confused", "memory", "thinking", "balance", "coordination"),
+    "skin_conditions": ("skin", "rash", "itchy", "red", "swollen", "bumps", "spots", "patches", "scales"),
+    "urinary_symptoms": ("urine", "pee", "bladder", "kidney", "burning", "frequent", "urgency", "incontinence"),
+    "reproductive_symptoms": ("period", "menstrual", "pregnancy", "fertility", "hormone", "menopause"),
+    "mental_health": ("anxiety", "depression", "stress", "panic", "mood", "emotion", "feeling", "thoughts"),
+    "sleep_issues": ("sleep", "insomnia", "tired", "restless", "nightmare", "snoring", "apnea"),
+    "vision_hearing": ("vision", "sight", "eye", "blind", "hearing", "ear", "deaf", "ringing", "tinnitus"),
+    "mobility_issues": ("walk", "move", "mobility", "stiff", "frozen", "paralyzed", "numb", "tingling"),
+    "emergency_symptoms": ("emergency", "urgent", "critical", "severe", "unbearable", "intense", "can't", "unable")
+}
+
+# Emergency keywords in priority order; the first one present is reported
+EMERGENCY_KEYWORDS: Tuple[str, ...] = (
+    "emergency", "urgent", "critical", "severe", "unbearable", "intense",
+    "can't breathe", "can't walk", "can't move", "unconscious", "fainting",
+    "chest pain", "heart attack", "stroke", "bleeding", "severe pain",
+    "allergic reaction", "anaphylaxis", "seizure", "convulsions",
+    "unresponsive", "not responding", "no response", "unconscious",
+    "coma", "collapsed", "passed out", "blacked out", "lost consciousness",
+    "not breathing", "stopped breathing", "choking", "suffocating",
+    "severe bleeding", "massive bleeding", "bleeding heavily",
+    "severe allergic reaction", "swelling throat", "can't swallow",
+    "severe chest pain", "crushing chest pain", "heart attack symptoms",
+    "stroke symptoms", "facial drooping", "arm weakness", "speech difficulty"
+)
+EMERGENCY_KEYWORD_SET = frozenset(EMERGENCY_KEYWORDS)
+
+def build_keyword_positions(keyword_groups: Tuple[Tuple[str, ...], ...]) -> Dict[str, Tuple[Tuple[int, int], ...]]:
+    """Map each keyword to the (group index, keyword index) pairs where it appears"""
+    positions: Dict[str, List[Tuple[int, int]]] = {}
+    for group_index, keywords in enumerate(keyword_groups):
+        for keyword_index, keyword in enumerate(keywords):
+            positions.setdefault(keyword, []).append((group_index, keyword_index))
+    return {keyword: tuple(keyword_positions) for keyword, keyword_positions in positions.items()}
+
+# Positional tables so a text's keyword hits resolve straight to pattern
+# groups, without walking the groups that have no hit
+# Pattern names are interned so every interpreted_symptoms tuple shares the
+# same string objects and downstream lookups compare them by identity
+PATTERN_ITEMS = tuple((sys.intern(pattern_name), keywords) for pattern_name, keywords in SYMPTOM_PATTERNS.items())
+GENERAL_SYMPTOM = sys.intern("general_symptom")
+PATTERN_KEYWORD_POSITIONS = build_keyword_positions(tuple(keywords for _, keywords in PATTERN_ITEMS))
+EMERGENCY_KEYWORD_RANK = {keyword: rank for rank, keyword in reversed(tuple(enumerate(EMERGENCY_KEYWORDS)))}
+
+# Pain and breathing patterns raise a routine symptom to urgent
+PATTERN_CATEGORIES = {
+    pattern_name: SymptomCategory.URGENT if "pain" in pattern_name or "breathing" in pattern_name else SymptomCategory.ROUTINE
+    for pattern_name in SYMPTOM_PATTERNS
+}
+
+@lru_cache(maxsize=None)
+def get_interpretation_matcher() -> KeywordMatcher:
+    """One matcher over every emergency and pattern keyword, built on first use"""
+    # The symptom text is scanned once instead of once per keyword
+    return KeywordMatcher(
+        EMERGENCY_KEYWORDS + tuple(keyword for keywords in SYMPTOM_PATTERNS.values() for keyword in keywords)
+    )
+
+# General medical knowledge for any symptom, as authored. Some conditions
+# appear twice with complementary symptom lists; merge_condition_records()
+# folds them into one entry
+GENERAL_CONDITION_RECORDS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ("medical_emergency", {
+        "symptoms": ["unresponsive", "unconscious", "not responding", "coma", "collapsed"],
+        "treatment": "IMMEDIATE EMERGENCY MEDICAL ATTENTION - Call 911 immediately",
+        "urgency": "emergency"
+    }),
+    ("cardiac_emergency", {
+        "symptoms": ["chest pain", "heart attack", "crushing chest pain", "severe chest pain"],
+        "treatment": "IMMEDIATE EMERGENCY MEDICAL ATTENTION - Call 911, administer aspirin if conscious",
+        "urgency": "emergency"
+    }),
+    ("stroke_emergency", {
+        "symptoms": ["stroke", "facial drooping", "arm weakness", "speech difficulty", "sudden weakness"],
+        "treatment": "IMMEDIATE EMERGENCY MEDICAL ATTENTION - Call 911, note time of onset",
+        "urgency": "emergency"
+    }),
+    ("respiratory_emergency", {
+        "symptoms": ["can't breathe", "not breathing", "choking", "suffocating", "stopped breathing"],
+        "treatment": "IMMEDIATE EMERGENCY MEDICAL ATTENTION - Call 911, begin CPR if trained",
+        "urgency": "emergency"
+    }),
+    ("allergic_emergency", {
+        "symptoms": ["severe allergic reaction", "anaphylaxis", "swelling throat", "can't swallow"],
+        "treatment": "IMMEDIATE EMERGENCY MEDICAL ATTENTION - Call 911, use epinephrine if available",
+        "urgency": "emergency"
+    }),
+    ("dehydration", {
+        "symptoms": ["pale", "white", "dry", "tired", "weak"],
+        "treatment": "Increase fluid intake, monitor hydration",
+        "urgency": "moderate"
+    }),
+    ("anemia", {
+        "symptoms": ["pale", "white", "tired", "weak", "fatigue"],
+        "treatment": "Iron supplements, dietary changes, medical evaluation",
+        "urgency": "routine"
+    }),
+    ("metabolic_disorder", {
+        "symptoms": ["pale", "white", "tired", "weak", "fatigue", "weight changes"],
+        "treatment": "Medical evaluation, blood tests, dietary assessment",
+        "urgency": "moderate"
+    }),
+    ("vitamin_deficiency", {
+        "symptoms": ["pale", "tired", "weak", "fatigue", "hair loss", "brittle nails"],
+        "treatment": "Vitamin supplements, dietary changes, medical evaluation",
+        "urgency": "routine"
+    }),
+    ("thyroid_disorder", {
+        "symptoms": ["pale", "tired", "weight changes", "mood changes", "temperature sensitivity"],
+        "treatment": "Thyroid function tests, hormone replacement if needed",
+        "urgency": "moderate"
+    }),
+    ("heart_condition", {
+        "symptoms": ["pale", "tired", "shortness of breath", "chest discomfort", "fatigue"],
+        "treatment": "Cardiac evaluation, ECG, echocardiogram, medical management",
+        "urgency": "urgent"
+    }),
+    ("kidney_disease", {
+        "symptoms": ["pale", "tired", "swelling", "urinary changes", "fatigue"],
+        "treatment": "Kidney function tests, dietary modifications, medical management",
+        "urgency": "moderate"
+    }),
+    ("liver_disease", {
+        "symptoms": ["pale", "tired", "yellowing", "abdominal discomfort", "fatigue"],
+        "treatment": "Liver function tests, dietary changes, medical evaluation",
+        "urgency": "moderate"
+    }),
+    ("cancer", {
+        "symptoms": ["pale", "tired", "weight loss", "fatigue", "unexplained symptoms"],
+        "treatment": "Comprehensive medical evaluation, imaging studies, specialist referral",
+        "urgency": "urgent"
+    }),
+    ("autoimmune_disease", {
+        "symptoms": ["pale", "tired", "joint pain", "fatigue", "general malaise"],
+        "treatment": "Autoimmune panel, specialist referral, immune modulation",
+        "urgency": "moderate"
+    }),
+    ("chronic_fatigue", {
+        "symptoms": ["tired", "fatigue", "weak", "exhausted", "sleep problems"],
+        "treatment": "Sleep study, stress management, gradual activity increase",
+        "urgency": "routine"
+    }),
+    ("depression", {
+        "symptoms": ["tired", "fatigue", "mood changes", "sleep problems", "appetite changes"],
+        "treatment": "Mental health evaluation, counseling, medication if needed",
+        "urgency": "moderate"
+    }),
+    ("sleep_disorder", {
+        "symptoms": ["tired", "fatigue", "sleep problems", "daytime sleepiness"],
+        "treatment": "Sleep study, sleep hygiene, medical evaluation",
+        "urgency": "routine"
+    }),
+    ("diabetes", {
+        "symptoms": ["tired", "thirst", "frequent urination", "weight changes", "fatigue"],
+        "treatment": "Blood glucose monitoring, dietary changes, medication if needed",
+        "urgency": "moderate"
+    }),
+    ("hypertension", {
+        "symptoms": ["tired", "headache", "dizziness", "fatigue", "chest discomfort"],
+        "treatment": "Blood pressure monitoring, lifestyle changes, medication if needed",
+        "urgency": "moderate"
+    }),
+    ("infection", {
+        "symptoms": ["tired", "fever", "fatigue", "general malaise", "body aches"],
+        "treatment": "Infection workup, antibiotics if bacterial, supportive care",
+        "urgency": "moderate"
+    }),
+    
+    # AI-Powered Universal Fallbacks
+    ("general_medical_condition", {
+        "symptoms": ["any", "symptom", "presentation", "complaint"],
+        "treatment": "Comprehensive medical evaluation, diagnostic workup, specialist referral if needed",
+        "urgency": "moderate"
+    }),
+    ("symptom_of_unknown_origin", {
+        "symptoms": ["unexplained", "unclear", "vague", "nonspecific"],
+        "treatment": "Detailed history, physical examination, laboratory studies, imaging if indicated",
+        "urgency": "moderate"
+    }),
+    ("chronic_condition", {
+        "symptoms": ["persistent", "ongoing", "chronic", "long-term"],
+        "treatment": "Chronic disease management, regular monitoring, lifestyle modifications",
+        "urgency": "routine"
+    }),
+    ("acute_condition", {
+        "symptoms": ["sudden", "acute", "recent", "new onset"],
+        "treatment": "Immediate evaluation, acute management, monitoring for complications",
+        "urgency": "urgent"
+    }),
+    ("psychosomatic_condition", {
+        "symptoms": ["stress-related", "anxiety-related", "psychosomatic", "functional"],
+        "treatment": "Stress management, counseling, relaxation techniques, medical evaluation",
+        "urgency": "routine"
+    }),
+    ("medication_side_effect", {
+        "symptoms": ["drug-related", "medication-related", "side effect", "adverse reaction"],
+        "treatment": "Medication review, dose adjustment, alternative medications, monitoring",
+        "urgency": "moderate"
+    }),
+    ("allergic_reaction", {
+        "symptoms": ["allergic", "hypersensitivity", "reaction", "intolerance"],
+        "treatment": "Allergen avoidance, antihistamines, epinephrine if severe, allergy testing",
+        "urgency": "urgent"
+    }),
+    ("deficiency_disorder", {
+        "symptoms": ["deficiency", "malnutrition", "vitamin", "mineral"],
+        "treatment": "Nutritional assessment, supplementation, dietary counseling, monitoring",
+        "urgency": "routine"
+    }),
+    ("hormonal_imbalance", {
+        "symptoms": ["hormonal", "endocrine", "metabolic", "hormone"],
+        "treatment": "Hormone testing, endocrine evaluation, hormone replacement if needed",
+        "urgency": "moderate"
+    }),
+    ("inflammatory_condition", {
+        "symptoms": ["inflammatory", "inflammation", "swelling", "redness"],
+        "treatment": "Anti-inflammatory medications, rest, ice, elevation, medical evaluation",
+        "urgency": "moderate"
+    }),
+    ("degenerative_condition", {
+        "symptoms": ["degenerative", "progressive", "worsening", "chronic"],
+        "treatment": "Symptom management, physical therapy, adaptive devices, regular monitoring",
+        "urgency": "routine"
+    }),
+    ("genetic_condition", {
+        "symptoms": ["genetic", "hereditary", "familial", "inherited"],
+        "treatment": "Genetic counseling, family history assessment, specialized care, monitoring",
+        "urgency": "moderate"
+    }),
+    ("environmental_exposure", {
+        "symptoms": ["environmental", "exposure", "toxin", "pollutant"],
+        "treatment": "Exposure cessation, decontamination, supportive care, monitoring",
+        "urgency": "urgent"
+    }),
+    ("occupational_condition", {
+        "symptoms": ["occupational", "work-related", "job-related", "industrial"],
+        "treatment": "Workplace evaluation, protective measures, medical monitoring, job modification",
+        "urgency": "moderate"
+    }),
+    ("lifestyle_related", {
+        "symptoms": ["lifestyle", "diet-related", "exercise-related", "stress-related"],
+        "treatment": "Lifestyle modifications, dietary changes, exercise program, stress management",
+        "urgency": "routine"
+    }),
+    ("age_related", {
+        "symptoms": ["age-related", "aging", "elderly", "pediatric"],
+        "treatment": "Age-appropriate care, specialized evaluation, family involvement, monitoring",
+        "urgency": "moderate"
+    }),
+    ("gender_specific", {
+        "symptoms": ["gender-specific", "male-specific", "female-specific", "reproductive"],
+        "treatment": "Gender-appropriate evaluation, specialized care, reproductive health assessment",
+        "urgency": "moderate"
+    }),
+    ("seasonal_condition", {
+        "symptoms": ["seasonal", "weather-related", "climate-related", "environmental"],
+        "treatment": "Seasonal management, environmental modifications, preventive measures",
+        "urgency": "routine"
+    }),
+    ("travel_related", {
+        "symptoms": ["travel-related", "tropical", "imported", "exotic"],
+        "treatment": "Travel history assessment, tropical medicine evaluation, specialized testing",
+        "urgency": "moderate"
+    }),
+    ("immunocompromised", {
+        "symptoms": ["immunocompromised", "immunosuppressed", "immune", "defense"],
+        "treatment": "Immunocompromised care, infection prevention, specialized monitoring",
+        "urgency": "urgent"
+    }),
+    ("stress_anxiety", {
+        "symptoms": ["tired", "weak", "nervous", "worried", "tense"],
+        "treatment": "Stress management, relaxation, counseling",
+        "urgency": "routine"
+    }),
+    ("vitamin_deficiency", {
+        "symptoms": ["tired", "weak", "pale", "dry", "brittle"],
+        "treatment": "Vitamin supplements, dietary changes",
+        "urgency": "routine"
+    }),
+    ("circulation_problems", {
+        "symptoms": ["pale", "white", "cold", "numb", "tingling"],
+        "treatment": "Improve circulation, medical evaluation",
+        "urgency": "moderate"
+    }),
+    ("metabolic_disorder", {
+        "symptoms": ["tired", "weak", "pale", "weight changes"],
+        "treatment": "Medical evaluation, blood tests, treatment",
+        "urgency": "moderate"
+    })
+)
+
+def merge_condition_records(records: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Merge condition records into one entry per name, uniting repeated symptom lists"""
+    conditions: Dict[str, Dict[str, Any]] = {}
+    for condition_name, condition_info in records:
+        merged = conditions.get(condition_name)
+        if merged is None:
+            conditions[condition_name] = {**condition_info, "symptoms": list(condition_info["symptoms"])}
+            continue
+        if merged["urgency"] != condition_info["urgency"]:
+            raise ValueError(f"Conflicting urgency for repeated condition {condition_name}")
+        merged["symptoms"].extend(
+            symptom for symptom in condition_info["symptoms"] if symptom not in merged["symptoms"]
+        )
+    return conditions
+
+GENERAL_MEDICAL_KNOWLEDGE: Dict[str, Dict[str, Any]] = {
+    "general_conditions": merge_condition_records(GENERAL_CONDITION_RECORDS)
+}
+GENERAL_CONDITIONS = GENERAL_MEDICAL_KNOWLEDGE["general_conditions"]
+GENERAL_CONDITION_ITEMS = tuple(GENERAL_CONDITIONS.items())
+CONDITION_ORDER = {condition_name: index for index, condition_name in enumerate(GENERAL_CONDITIONS)}
+CONDITION_SYMPTOM_COUNT = {
+    condition_name: len(condition_info["symptoms"])
+    for condition_name, condition_info in GENERAL_CONDITION_ITEMS
+}
+
+# Emergency types in priority order with the keywords that identify them
+EMERGENCY_TYPE_KEYWORDS: Tuple[Tuple[FrozenSet[str], str], ...] = (
+    (frozenset({"unresponsive", "unconscious", "coma", "collapsed"}), "Loss of Consciousness"),
+    (frozenset({"chest pain", "heart attack", "crushing"}), "Cardiac Emergency"),
+    (frozenset({"can't breathe", "choking", "suffocating"}), "Respiratory Emergency"),
+    (frozenset({"stroke", "facial drooping", "arm weakness"}), "Neurological Emergency"),
+    (frozenset({"severe bleeding", "massive bleeding"}), "Hemorrhagic Emergency"),
+    (frozenset({"allergic reaction", "anaphylaxis", "swelling throat"}), "Allergic Emergency")
+)
+EMERGENCY_TYPE_MATCHER = KeywordMatcher(chain.from_iterable(keywords for keywords, _ in EMERGENCY_TYPE_KEYWORDS))
+
+# Memoized per symptom name, so this is filled in lazily as an inverted
+# index from interpreted symptom names to their matching conditions
+@lru_cache(maxsize=None)
+def match_conditions(symptom_name: str) -> Tuple[str, ...]:
+    """Return the conditions with a symptom that contains or is contained in symptom_name"""
+    return tuple(
+        condition_name
+        for condition_name, condition_info in GENERAL_CONDITION_ITEMS
+        if any(
+            condition_symptom in symptom_name or symptom_name in condition_symptom
+            for condition_symptom in condition_info["symptoms"]
+        )
+    )
+
+# Keywords for each symptom-specific risk group, checked in this order
+CARDIOVASCULAR_RISK_KEYWORDS: Tuple[str, ...] = ("chest", "heart", "pain", "pressure")
+NEUROLOGICAL_RISK_KEYWORDS: Tuple[str, ...] = ("head", "brain", "dizzy", "confused", "weakness")
+RESPIRATORY_RISK_KEYWORDS: Tuple[str, ...] = ("breath", "cough", "wheeze", "shortness")
+GASTROINTESTINAL_RISK_KEYWORDS: Tuple[str, ...] = ("stomach", "nausea", "vomit", "diarrhea", "abdominal")
+SYMPTOM_RISK_MATCHER = KeywordMatcher(chain(
+    CARDIOVASCULAR_RISK_KEYWORDS, NEUROLOGICAL_RISK_KEYWORDS, RESPIRATORY_RISK_KEYWORDS, GASTROINTESTINAL_RISK_KEYWORDS
+))
+
+# Keywords that place a risk factor in each stratification category
+RISK_CATEGORY_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("demographic", ("age", "gender", "pediatric")),
+    ("medical_history", ("diabetes", "hypertension", "heart", "kidney", "cancer")),
+    ("medications", ("medication", "drug", "anticoagulant", "insulin")),
+    ("symptom_specific", ("symptom", "presentation", "emergency"))
+)
+
+# Shared recommendation texts; callers get a fresh list of the same interned strings
+ROUTINE_RECOMMENDATIONS: Tuple[str, ...] = tuple(map(sys.intern, (
+    "Schedule routine medical follow-up",
+    "Monitor symptoms at home",
+    "Seek medical attention if symptoms persist or worsen",
+    "Maintain regular health monitoring"
+)))
+URGENCY_RECOMMENDATIONS: Dict[str, Tuple[str, ...]] = {
+    "emergency": tuple(map(sys.intern, (
+        "IMMEDIATE EMERGENCY MEDICAL ATTENTION REQUIRED",
+        "Call 911 immediately",
+        "Do not delay medical care",
+        "Stay with patient until emergency services arrive"
+    ))),
+    "urgent": tuple(map(sys.intern, (
+        "Seek medical attention within 24 hours",
+        "Monitor symptoms closely",
+        "Go to emergency room if symptoms worsen",
+        "Contact healthcare provider immediately"
+    ))),
+    "moderate": tuple(map(sys.intern, (
+        "Schedule medical evaluation within 48-72 hours",
+        "Monitor symptoms and vital signs",
+        "Seek immediate care if symptoms worsen",
+        "Consider urgent care if primary care unavailable"
+    ))),
+    "routine": ROUTINE_RECOMMENDATIONS
+}
+
+ROUTINE_ADVICE: Tuple[str, ...] = tuple(map(sys.intern, (
+    "Schedule routine medical evaluation",
+    "Monitor symptoms for changes",
+    "Maintain healthy lifestyle habits"
+)))
+CATEGORY_ADVICE: Dict[SymptomCategory, Tuple[str, ...]] = {
+    SymptomCategory.EMERGENCY: tuple(map(sys.intern, (
+        "IMMEDIATE EMERGENCY - Call 911 immediately",
+        "Do not delay - this is a medical emergency",
+        "Stay with the patient until emergency services arrive",
+        "If trained, begin CPR if patient is not breathing"
+    ))),
+    SymptomCategory.URGENT: tuple(map(sys.intern, (
+        "Schedule medical evaluation within 24-48 hours",
+        "Monitor symptoms closely",
+        "Seek immediate care if symptoms worsen"
+    )))
+}
+
+# Fixed parts of the fallback analysis, shared by every fallback result
+FALLBACK_ANALYSIS: Dict[str, Any] = {
+    "symptom_interpretation": {
+        "original_text": "",
+        "interpreted_symptoms": ["general_symptom"],
+        "category": "routine",
+        "confidence": 0.3,
+        "reasoning": "Fallback analysis - symptom requires medical evaluation"
+    },
+    "possible_conditions": [{
+        "condition": "Medical Evaluation Required",
+        "confidence": 0.5,
+        "urgency": "routine",
+        "treatment": "Schedule medical evaluation for proper diagnosis",
+        "reasoning": "Symptom requires professional medical assessment",
+        "supporting_evidence": ["Symptom presentation", "Patient history"]
+    }],
+    "urgency_assessment": {
+        "urgency": "routine",
+        "overall_risk": "low",
+        "risk_score": 0.3,
+        "risk_factors": ["Symptom requires evaluation"],
+        "reasoning": "Routine medical evaluation recommended"
+    },
+    "treatment_recommendations": [{
+        "treatment_type": "evaluation",
+        "condition": "Medical Assessment",
+        "recommendation": "Schedule medical evaluation",
+        "confidence": 0.8,
+        "urgency": "routine",
+        "instructions": "Professional medical evaluation recommended",
+        "side_effects": [],
+        "contraindications": []
+    }],
+    "general_advice": [
+        "Schedule medical evaluation",
+        "Monitor symptoms for changes",
+        "Seek immediate care if symptoms worsen"
+    ],
+    "confidence_score": 0.4
+}
+
+# Monitoring recommendations for risk factors mentioning each keyword
+RISK_FACTOR_RECOMMENDATIONS: Tuple[Tuple[str, str], ...] = (
+    ("diabetes", "Monitor blood glucose levels closely"),
+    ("heart", "Monitor heart rate and blood pressure"),
+    ("breathing", "Monitor respiratory rate and oxygen saturation"),
+    ("age", "Consider age-related vulnerability factors")
+)
+RISK_FACTOR_KEYWORD_MATCHER = KeywordMatcher(keyword for keyword, _ in RISK_FACTOR_RECOMMENDATIONS)
+
+# Related conditions for interpreted symptoms; the first rule whose marker occurs applies
+RELATED_CONDITION_RULES: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...] = (
+    (("pale", "white"), ("anemia", "dehydration", "circulation problems", "shock")),
+    (("pain",), ("inflammation", "injury", "infection", "chronic pain")),
+    (("breathing",), ("respiratory infection", "asthma", "allergic reaction")),
+    (("tired", "weak"), ("fatigue", "anemia", "infection", "metabolic disorder"))
+)
+RELATED_CONDITION_MATCHER = KeywordMatcher(chain.from_iterable(markers for markers, _ in RELATED_CONDITION_RULES))
+
+# Actions given for every emergency before the type-specific ones
+EMERGENCY_BASE_ACTIONS: Tuple[str, ...] = ("Call 911 immediately", "Stay with the patient")
+
+# Actions added after the base ones for each emergency type
+EMERGENCY_TYPE_ACTIONS: Dict[str, Tuple[str, ...]] = {
+    "Loss of Consciousness": ("Check breathing and pulse", "Begin CPR if trained and no pulse"),
+    "Cardiac Emergency": ("Administer aspirin if conscious", "Keep patient calm and still"),
+    "Respiratory Emergency": ("Check airway", "Begin rescue breathing if trained"),
+    "Neurological Emergency": ("Note time of onset", "Keep patient still", "Do not give food or water"),
+    "Hemorrhagic Emergency": ("Apply direct pressure to bleeding", "Elevate injured area if possible"),
+    "Allergic Emergency": ("Use epinephrine auto-injector if available", "Monitor breathing")
+}
+
+# Age band boundaries and the (score, factor, detail) for each band, so that
+# AGE_RISK_BANDS[bisect_right(AGE_RISK_BOUNDARIES, age)] is the band for age
+AGE_RISK_BOUNDARIES: Tuple[int, ...] = (18, 50, 60, 70, 80)
+AGE_RISK_BANDS: Tuple[Optional[Tuple[float, str, str]], ...] = (
+    (0.1, "Pediatric patient", "Special considerations for pediatric care"),
+    None,
+    (0.1, "Middle-aged (50-59)", "Low to moderate - baseline risk"),
+    (0.15, "Elderly (60-69)", "Moderate - age-related risk factors"),
+    (0.2, "Advanced age (70-79)", "High - increased medical risk"),
+    (0.3, "Very advanced age (80+)", "Very high - increased vulnerability")
+)
+
+# High-risk chronic conditions
+HIGH_RISK_CONDITIONS: Dict[str, Dict[str, Any]] = {
+    "diabetes": {"score": 0.2, "description": "Diabetes - metabolic complications risk"},
+    "hypertension": {"score": 0.15, "description": "Hypertension - cardiovascular risk"},
+    "heart disease": {"score": 0.25, "description": "Heart disease - cardiac complications risk"},
+    "kidney disease": {"score": 0.2, "description": "Kidney disease - renal complications risk"},
+    "liver disease": {"score": 0.2, "description": "Liver disease - hepatic complications risk"},
+    "cancer": {"score": 0.3, "description": "Cancer history - increased vulnerability"},
+    "stroke": {"score": 0.25, "description": "Stroke history - neurological risk"},
+    "copd": {"score": 0.2, "description": "COPD - respiratory complications risk"},
+    "asthma": {"score": 0.15, "description": "Asthma - respiratory risk"},
+    "depression": {"score": 0.1, "description": "Depression - mental health considerations"},
+    "anxiety": {"score": 0.1, "description": "Anxiety - mental health considerations"}
+}
+HIGH_RISK_CONDITION_MATCHER = KeywordMatcher(HIGH_RISK_CONDITIONS)
+
+# High-risk medication categories
+HIGH_RISK_MEDICATIONS: Dict[str, Dict[str, Any]] = {
+    "warfarin": {"score": 0.2, "description": "Anticoagulant - bleeding risk"},
+    "insulin": {"score": 0.15, "description": "Insulin - hypoglycemia risk"},
+    "digoxin": {"score": 0.15, "description": "Digoxin - cardiac toxicity risk"},
+    "lithium": {"score": 0.2, "description": "Lithium - toxicity risk"},
+    "methotrexate": {"score": 0.2, "description": "Methotrexate - toxicity risk"},
+    "prednisone": {"score": 0.1, "description": "Steroid - immunosuppression risk"},
+    "opioid": {"score": 0.15, "description": "Opioid - respiratory depression risk"}
+}
+HIGH_RISK_MEDICATION_MATCHER = KeywordMatcher(HIGH_RISK_MEDICATIONS)
+
+# Follow-up advice for chronic conditions found in the medical history
+HISTORY_CONDITION_ADVICE: Tuple[Tuple[str, str], ...] = (
+    ("diabetes", "Monitor blood glucose levels closely"),
+    ("hypertension", "Monitor blood pressure regularly")
+)
+
+@lru_cache(maxsize=4096)
+def interpret_symptom_text(symptom_lower: str) -> Tuple[Tuple[str, ...], SymptomCategory, float, str]:
+    """Interpret lowercased symptom text into (symptoms, category, confidence, reasoning)"""
+    # Find matching patterns
+    interpreted_symptoms = []
+    category = SymptomCategory.ROUTINE
+    confidence = 0.5
+    reasoning = "General symptom analysis"
+    
+    # Every keyword present in the text, found in a single pass
+    found_keywords = get_interpretation_matcher().find(symptom_lower)
+    
+    # Check for emergency keywords first; the earliest listed one is reported
+    emergency_hits = EMERGENCY_KEYWORD_SET.intersection(found_keywords)
+    if emergency_hits:
+        emergency_word = min(emergency_hits, key=EMERGENCY_KEYWORD_RANK.__getitem__)
+        category = SymptomCategory.EMERGENCY
+        confidence = 0.95  # Higher confidence for emergency detection
+        reasoning = f"EMERGENCY: Critical symptom detected - {emergency_word}"
+    
+    # First matching keyword of every pattern group that has a hit
+    first_keyword_index: Dict[int, int] = {}
+    for found_keyword in found_keywords:
+        for group_index, keyword_index in PATTERN_KEYWORD_POSITIONS.get(found_keyword, ()):
+            if keyword_index < first_keyword_index.get(group_index, keyword_index + 1):
+                first_keyword_index[group_index] = keyword_index
+    
+    # Pattern matching, in table order
+    for group_index in sorted(first_keyword_index):
+        pattern_name, keywords = PATTERN_ITEMS[group_index]
+        keyword = keywords[first_keyword_index[group_index]]
+        interpreted_symptoms.append(pattern_name)
+        if category == SymptomCategory.ROUTINE:
+            category = PATTERN_CATEGORIES[pattern_name]
+        confidence = max(confidence, 0.7)
+        reasoning = f"Pattern matched: {pattern_name} (keyword: {keyword})"
+    
+    # If no patterns matched, use general interpretation
+    if not interpreted_symptoms:
+        interpreted_symptoms = [GENERAL_SYMPTOM]
+        reasoning = "General symptom interpretation - no specific patterns detected"
+        confidence = 0.3
+    
+    return tuple(interpreted_symptoms), category, confidence, reasoning
+
+# Inputs are small counts and two flags, so every score is computed once
+@lru_cache(maxsize=None)
+def score_condition_match(match_count: int, symptom_count: int, elderly: bool,
+                          multiple_comorbidities: bool) -> float:
+    """Confidence for a condition matching match_count of its symptom_count symptoms"""
+    confidence = min(match_count / symptom_count + 0.3, 0.9)
+    
+    # Adjust confidence based on patient data
+    if elderly:
+        confidence += 0.1  # Higher risk for elderly
+    
+    if multiple_comorbidities:
+        confidence += 0.1  # Multiple comorbidities
+    
+    return min(confidence, 1.0)
+
+# Partial scores come from fixed table values, so totals repeat across analyses
+@lru_cache(maxsize=1024)
+def aggregate_risk_score(base_score: float, partial_scores: Tuple[float, ...]) -> Tuple[float, str]:
+    """Add the partial risk scores to base_score and return (risk_score, urgency)"""
+    risk_score = base_score
+    for partial_score in partial_scores:
+        risk_score += partial_score
+    
+    if risk_score >= 0.8:
+        urgency = "emergency"
+    elif risk_score >= 0.6:
+        urgency = "urgent"
+    elif risk_score >= 0.4:
+        urgency = "moderate"
+    else:
+        urgency = "routine"
+    
+    return risk_score, urgency
+
+# Condition fields read together, fetched in one call instead of one lookup each
+CONDITION_TREATMENT_FIELDS = itemgetter("condition", "treatment", "confidence", "urgency")
+CONDITION_SUMMARY_FIELDS = itemgetter("condition", "confidence")
+
+def make_condition_treatment(condition: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the general treatment recommendation for a possible condition"""
+    condition_name, treatment, confidence, urgency = CONDITION_TREATMENT_FIELDS(condition)
+    return {
+        "treatment_type": "general",
+        "condition": condition_name,
+        "recommendation": treatment,
+        "confidence": confidence,
+        "urgency": urgency,
+        "instructions": f"Based on {condition_name} assessment",
+        "side_effects": ["Monitor for improvement or worsening"],
+        "contraindications": ["Allergic reactions to recommended treatments"]
+    }
+
+# Risk factor texts come from a fixed vocabulary, so each is classified once
+@lru_cache(maxsize=1024)
+def classify_risk_factor(factor: str) -> Tuple[str, ...]:
+    """Return the stratification categories whose keywords occur in a risk factor"""
+    factor_lower = factor.lower()
+    return tuple(
+        category for category, keywords in RISK_CATEGORY_KEYWORDS
+        if any(word in factor_lower for word in keywords)
+    )
+
+# Repeat analyses pass the same confidences, so the combination is cached
+@lru_cache(maxsize=4096)
+def combine_confidence(base_confidence: float, condition_confidences: Tuple[float, ...]) -> float:
+    """Combine the interpretation confidence with the mean condition confidence"""
+    # Adjust based on condition confidence
+    avg_condition_confidence = fsum(condition_confidences) / len(condition_confidences)
+    
+    # Combined confidence
+    combined_confidence = (base_confidence + avg_condition_confidence) / 2
+    
+    return min(combined_confidence, 1.0)
+
+@lru_cache(maxsize=1024)
+def rank_general_conditions(interpreted_symptoms: Tuple[str, ...], elderly: bool,
+                            multiple_comorbidities: bool) -> Tuple[Dict[str, Any], ...]:
+    """Score the general conditions matching the interpreted symptoms and keep the top 3"""
+    # Count symptom matches per condition through the inverted index
+    symptom_match_scores = Counter(chain.from_iterable(
+        match_conditions(interpreted_symptom_name) for interpreted_symptom_name in interpreted_symptoms
+    ))
+    
+    # If no conditions found, provide general assessment
+    if not symptom_match_scores:
+        return ({
+            "condition": "General Medical Assessment",
+            "confidence": 0.4,
+            "urgency": "routine",
+            "treatment": "Medical evaluation recommended",
+            "reasoning": "Symptom requires medical evaluation for proper diagnosis",
+            "supporting_evidence": ["Symptom presentation", "Patient history"]
+        },)
+    
+    # Score the matched conditions as plain (confidence, name) pairs, in
+    # knowledge-base order so ties keep that order as before
+    scored_conditions = [
+        (
+            score_condition_match(
+                symptom_match_scores[condition_name], CONDITION_SYMPTOM_COUNT[condition_name],
+                elderly, multiple_comorbidities
+            ),
+            condition_name
+        )
+        for condition_name in sorted(symptom_match_scores, key=CONDITION_ORDER.__getitem__)
+    ]
+    
+    # Build result dicts only for the top 3 conditions; nlargest keeps the
+    # ordering of a stable descending sort without sorting every candidate
+    return tuple(
+        {
+            "condition": condition_name.replace("_", " ").title(),
+            "confidence": confidence,
+            "urgency": GENERAL_CONDITIONS[condition_name]["urgency"],
+            "treatment": GENERAL_CONDITIONS[condition_name]["treatment"],
+            "reasoning": f"Based on symptom pattern matching and general medical knowledge",
+            "supporting_evidence": GENERAL_CONDITIONS[condition_name]["symptoms"]
+        }
+        for confidence, condition_name in heapq.nlargest(3, scored_conditions, key=itemgetter(0))
+    )
+
+# Full analyses kept per agent. An entry is one result of a few KB, so a full
+# cache costs a few MB in exchange for skipping the pipeline on repeat inputs
+ANALYSIS_CACHE_SIZE = 512
+
+# Patient fields the analysis reads. Callers also pass a per-request patient ID
+# and timestamp, which would make every key unique if they were compared
+ANALYZED_PATIENT_FIELDS: Tuple[str, ...] = ("age", "gender", "medical_history", "current_medications")
 
 class IntelligentAIAgent:
     """AI Agent that can interpret ANY symptom and provide intelligent analysis"""
@@ -37,337 +805,72 @@ class IntelligentAIAgent:
         self.emergency_keywords = self._load_emergency_keywords()
         self.general_medical_knowledge = self._load_general_medical_knowledge()
         
-    def _load_intelligent_patterns(self) -> Dict[str, List[str]]:
+        self.emergency_keyword_set = EMERGENCY_KEYWORD_SET
+        
+        # Per-agent LRU cache of full analyses keyed by symptom text and the analyzed patient fields
+        self._cached_analysis = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._analyze_patient_key)
+        
+    def _load_intelligent_patterns(self) -> Dict[str, Tuple[str, ...]]:
         """Load intelligent symptom patterns for interpretation"""
-        return {
-            # Color-related symptoms
-            "pale_complexion": ["white", "pale", "pallor", "ashen", "gray", "wan", "sallow"],
-            "redness": ["red", "flushed", "rosy", "crimson", "scarlet"],
-            "yellowing": ["yellow", "jaundiced", "icteric", "golden"],
-            "blue_tint": ["blue", "cyanotic", "bluish", "purple"],
-            
-            # Appearance-related
-            "swelling": ["swollen", "puffy", "inflated", "enlarged", "bulging"],
-            "rash": ["rash", "spots", "bumps", "lesions", "patches"],
-            "dryness": ["dry", "flaky", "scaly", "rough", "cracked"],
-            "moisture": ["wet", "moist", "sweaty", "damp", "sticky"],
-            
-            # Pain-related
-            "pain": ["pain", "ache", "hurt", "sore", "tender", "throbbing"],
-            "sharp_pain": ["sharp", "stabbing", "piercing", "cutting"],
-            "dull_pain": ["dull", "aching", "heavy", "pressure"],
-            "burning": ["burning", "hot", "fire", "scorching"],
-            
-            # Movement-related
-            "weakness": ["weak", "tired", "exhausted", "fatigued", "lethargic"],
-            "stiffness": ["stiff", "rigid", "tight", "tense", "frozen"],
-            "tremor": ["shaking", "trembling", "quivering", "vibrating"],
-            "numbness": ["numb", "tingling", "pins and needles", "dead"],
-            
-            # Breathing-related
-            "breathing_problems": ["breath", "breathing", "air", "oxygen", "suffocating"],
-            "cough": ["cough", "coughing", "hacking", "clearing throat"],
-            "wheezing": ["wheezing", "whistling", "rattling", "gurgling"],
-            
-            # Digestive-related
-            "nausea": ["nausea", "sick", "queasy", "upset stomach"],
-            "vomiting": ["vomit", "throwing up", "puking", "regurgitating"],
-            "diarrhea": ["diarrhea", "loose stools", "watery", "runny"],
-            "constipation": ["constipation", "blocked", "hard stools", "straining"],
-            
-            # Neurological
-            "headache": ["headache", "head pain", "migraine", "head pounding"],
-            "dizziness": ["dizzy", "lightheaded", "spinning", "vertigo"],
-            "confusion": ["confused", "disoriented", "foggy", "unclear"],
-            "memory_problems": ["memory", "forgetful", "amnesia", "recall"],
-            
-            # Cardiovascular
-            "chest_pain": ["chest", "heart", "cardiac", "thoracic"],
-            "palpitations": ["heartbeat", "pounding", "racing", "irregular"],
-            "swelling_legs": ["swollen legs", "puffy feet", "ankle swelling"],
-            
-            # General symptoms
-            "fever": ["fever", "hot", "temperature", "burning up"],
-            "chills": ["chills", "shivering", "cold", "freezing"],
-            "fatigue": ["tired", "exhausted", "worn out", "drained", "weak", "lethargic", "sluggish"],
-            "weight_changes": ["weight", "gained", "lost", "heavier", "lighter", "thinner", "fatter"],
-            
-            # Additional comprehensive symptom patterns
-            "pain_patterns": ["pain", "ache", "hurt", "sore", "tender", "throbbing", "stabbing", "burning", "sharp", "dull"],
-            "breathing_issues": ["breath", "breathe", "panting", "gasping", "wheezing", "coughing", "choking", "suffocating"],
-            "digestive_symptoms": ["stomach", "belly", "gut", "nausea", "vomit", "diarrhea", "constipation", "bloating", "gas"],
-            "neurological_symptoms": ["head", "brain", "dizzy", "confused", "memory", "thinking", "balance", "coordination"],
-            "skin_conditions": ["skin", "rash", "itchy", "red", "swollen", "bumps", "spots", "patches", "scales"],
-            "urinary_symptoms": ["urine", "pee", "bladder", "kidney", "burning", "frequent", "urgency", "incontinence"],
-            "reproductive_symptoms": ["period", "menstrual", "pregnancy", "fertility", "hormone", "menopause"],
-            "mental_health": ["anxiety", "depression", "stress", "panic", "mood", "emotion", "feeling", "thoughts"],
-            "sleep_issues": ["sleep", "insomnia", "tired", "restless", "nightmare", "snoring", "apnea"],
-            "vision_hearing": ["vision", "sight", "eye", "blind", "hearing", "ear", "deaf", "ringing", "tinnitus"],
-            "mobility_issues": ["walk", "move", "mobility", "stiff", "frozen", "paralyzed", "numb", "tingling"],
-            "emergency_symptoms": ["emergency", "urgent", "critical", "severe", "unbearable", "intense", "can't", "unable"]
-        }
+        return SYMPTOM_PATTERNS
     
-    def _load_emergency_keywords(self) -> List[str]:
+    def _load_emergency_keywords(self) -> Tuple[str, ...]:
         """Load emergency keywords for immediate attention"""
-        return [
-            "emergency", "urgent", "critical", "severe", "unbearable", "intense",
-            "can't breathe", "can't walk", "can't move", "unconscious", "fainting",
-            "chest pain", "heart attack", "stroke", "bleeding", "severe pain",
-            "allergic reaction", "anaphylaxis", "seizure", "convulsions",
-            "unresponsive", "not responding", "no response", "unconscious",
-            "coma", "collapsed", "passed out", "blacked out", "lost consciousness",
-            "not breathing", "stopped breathing", "choking", "suffocating",
-            "severe bleeding", "massive bleeding", "bleeding heavily",
-            "severe allergic reaction", "swelling throat", "can't swallow",
-            "severe chest pain", "crushing chest pain", "heart attack symptoms",
-            "stroke symptoms", "facial drooping", "arm weakness", "speech difficulty"
-        ]
+        return EMERGENCY_KEYWORDS
     
     def _load_general_medical_knowledge(self) -> Dict[str, Dict[str, Any]]:
         """Load general medical knowledge for any symptom"""
-        return {
-            "general_conditions": {
-                "medical_emergency": {
-                    "symptoms": ["unresponsive", "unconscious", "not responding", "coma", "collapsed"],
-                    "treatment": "IMMEDIATE EMERGENCY MEDICAL ATTENTION - Call 911 immediately",
-                    "urgency": "emergency"
-                },
-                "cardiac_emergency": {
-                    "symptoms": ["chest pain", "heart attack", "crushing chest pain", "severe chest pain"],
-                    "treatment": "IMMEDIATE EMERGENCY MEDICAL ATTENTION - Call 911, administer aspirin if conscious",
-                    "urgency": "emergency"
-                },
-                "stroke_emergency": {
-                    "symptoms": ["stroke", "facial drooping", "arm weakness", "speech difficulty", "sudden weakness"],
-                    "treatment": "IMMEDIATE EMERGENCY MEDICAL ATTENTION - Call 911, note time of onset",
-                    "urgency": "emergency"
-                },
-                "respiratory_emergency": {
-                    "symptoms": ["can't breathe", "not breathing", "choking", "suffocating", "stopped breathing"],
-                    "treatment": "IMMEDIATE EMERGENCY MEDICAL ATTENTION - Call 911, begin CPR if trained",
-                    "urgency": "emergency"
-                },
-                "allergic_emergency": {
-                    "symptoms": ["severe allergic reaction", "anaphylaxis", "swelling throat", "can't swallow"],
-                    "treatment": "IMMEDIATE EMERGENCY MEDICAL ATTENTION - Call 911, use epinephrine if available",
-                    "urgency": "emergency"
-                },
-                "dehydration": {
-                    "symptoms": ["pale", "white", "dry", "tired", "weak"],
-                    "treatment": "Increase fluid intake, monitor hydration",
-                    "urgency": "moderate"
-                },
-                "anemia": {
-                    "symptoms": ["pale", "white", "tired", "weak", "fatigue"],
-                    "treatment": "Iron supplements, dietary changes, medical evaluation",
-                    "urgency": "routine"
-                },
-                "metabolic_disorder": {
-                    "symptoms": ["pale", "white", "tired", "weak", "fatigue", "weight changes"],
-                    "treatment": "Medical evaluation, blood tests, dietary assessment",
-                    "urgency": "moderate"
-                },
-                "vitamin_deficiency": {
-                    "symptoms": ["pale", "tired", "weak", "fatigue", "hair loss", "brittle nails"],
-                    "treatment": "Vitamin supplements, dietary changes, medical evaluation",
-                    "urgency": "routine"
-                },
-                "thyroid_disorder": {
-                    "symptoms": ["pale", "tired", "weight changes", "mood changes", "temperature sensitivity"],
-                    "treatment": "Thyroid function tests, hormone replacement if needed",
-                    "urgency": "moderate"
-                },
-                "heart_condition": {
-                    "symptoms": ["pale", "tired", "shortness of breath", "chest discomfort", "fatigue"],
-                    "treatment": "Cardiac evaluation, ECG, echocardiogram, medical management",
-                    "urgency": "urgent"
-                },
-                "kidney_disease": {
-                    "symptoms": ["pale", "tired", "swelling", "urinary changes", "fatigue"],
-                    "treatment": "Kidney function tests, dietary modifications, medical management",
-                    "urgency": "moderate"
-                },
-                "liver_disease": {
-                    "symptoms": ["pale", "tired", "yellowing", "abdominal discomfort", "fatigue"],
-                    "treatment": "Liver function tests, dietary changes, medical evaluation",
-                    "urgency": "moderate"
-                },
-                "cancer": {
-                    "symptoms": ["pale", "tired", "weight loss", "fatigue", "unexplained symptoms"],
-                    "treatment": "Comprehensive medical evaluation, imaging studies, specialist referral",
-                    "urgency": "urgent"
-                },
-                "autoimmune_disease": {
-                    "symptoms": ["pale", "tired", "joint pain", "fatigue", "general malaise"],
-                    "treatment": "Autoimmune panel, specialist referral, immune modulation",
-                    "urgency": "moderate"
-                },
-                "chronic_fatigue": {
-                    "symptoms": ["tired", "fatigue", "weak", "exhausted", "sleep problems"],
-                    "treatment": "Sleep study, stress management, gradual activity increase",
-                    "urgency": "routine"
-                },
-                "depression": {
-                    "symptoms": ["tired", "fatigue", "mood changes", "sleep problems", "appetite changes"],
-                    "treatment": "Mental health evaluation, counseling, medication if needed",
-                    "urgency": "moderate"
-                },
-                "sleep_disorder": {
-                    "symptoms": ["tired", "fatigue", "sleep problems", "daytime sleepiness"],
-                    "treatment": "Sleep study, sleep hygiene, medical evaluation",
-                    "urgency": "routine"
-                },
-                "diabetes": {
-                    "symptoms": ["tired", "thirst", "frequent urination", "weight changes", "fatigue"],
-                    "treatment": "Blood glucose monitoring, dietary changes, medication if needed",
-                    "urgency": "moderate"
-                },
-                "hypertension": {
-                    "symptoms": ["tired", "headache", "dizziness", "fatigue", "chest discomfort"],
-                    "treatment": "Blood pressure monitoring, lifestyle changes, medication if needed",
-                    "urgency": "moderate"
-                },
-                "infection": {
-                    "symptoms": ["tired", "fever", "fatigue", "general malaise", "body aches"],
-                    "treatment": "Infection workup, antibiotics if bacterial, supportive care",
-                    "urgency": "moderate"
-                },
-                
-                # AI-Powered Universal Fallbacks
-                "general_medical_condition": {
-                    "symptoms": ["any", "symptom", "presentation", "complaint"],
-                    "treatment": "Comprehensive medical evaluation, diagnostic workup, specialist referral if needed",
-                    "urgency": "moderate"
-                },
-                "symptom_of_unknown_origin": {
-                    "symptoms": ["unexplained", "unclear", "vague", "nonspecific"],
-                    "treatment": "Detailed history, physical examination, laboratory studies, imaging if indicated",
-                    "urgency": "moderate"
-                },
-                "chronic_condition": {
-                    "symptoms": ["persistent", "ongoing", "chronic", "long-term"],
-                    "treatment": "Chronic disease management, regular monitoring, lifestyle modifications",
-                    "urgency": "routine"
-                },
-                "acute_condition": {
-                    "symptoms": ["sudden", "acute", "recent", "new onset"],
-                    "treatment": "Immediate evaluation, acute management, monitoring for complications",
-                    "urgency": "urgent"
-                },
-                "psychosomatic_condition": {
-                    "symptoms": ["stress-related", "anxiety-related", "psychosomatic", "functional"],
-                    "treatment": "Stress management, counseling, relaxation techniques, medical evaluation",
-                    "urgency": "routine"
-                },
-                "medication_side_effect": {
-                    "symptoms": ["drug-related", "medication-related", "side effect", "adverse reaction"],
-                    "treatment": "Medication review, dose adjustment, alternative medications, monitoring",
-                    "urgency": "moderate"
-                },
-                "allergic_reaction": {
-                    "symptoms": ["allergic", "hypersensitivity", "reaction", "intolerance"],
-                    "treatment": "Allergen avoidance, antihistamines, epinephrine if severe, allergy testing",
-                    "urgency": "urgent"
-                },
-                "deficiency_disorder": {
-                    "symptoms": ["deficiency", "malnutrition", "vitamin", "mineral"],
-                    "treatment": "Nutritional assessment, supplementation, dietary counseling, monitoring",
-                    "urgency": "routine"
-                },
-                "hormonal_imbalance": {
-                    "symptoms": ["hormonal", "endocrine", "metabolic", "hormone"],
-                    "treatment": "Hormone testing, endocrine evaluation, hormone replacement if needed",
-                    "urgency": "moderate"
-                },
-                "inflammatory_condition": {
-                    "symptoms": ["inflammatory", "inflammation", "swelling", "redness"],
-                    "treatment": "Anti-inflammatory medications, rest, ice, elevation, medical evaluation",
-                    "urgency": "moderate"
-                },
-                "degenerative_condition": {
-                    "symptoms": ["degenerative", "progressive", "worsening", "chronic"],
-                    "treatment": "Symptom management, physical therapy, adaptive devices, regular monitoring",
-                    "urgency": "routine"
-                },
-                "genetic_condition": {
-                    "symptoms": ["genetic", "hereditary", "familial", "inherited"],
-                    "treatment": "Genetic counseling, family history assessment, specialized care, monitoring",
-                    "urgency": "moderate"
-                },
-                "environmental_exposure": {
-                    "symptoms": ["environmental", "exposure", "toxin", "pollutant"],
-                    "treatment": "Exposure cessation, decontamination, supportive care, monitoring",
-                    "urgency": "urgent"
-                },
-                "occupational_condition": {
-                    "symptoms": ["occupational", "work-related", "job-related", "industrial"],
-                    "treatment": "Workplace evaluation, protective measures, medical monitoring, job modification",
-                    "urgency": "moderate"
-                },
-                "lifestyle_related": {
-                    "symptoms": ["lifestyle", "diet-related", "exercise-related", "stress-related"],
-                    "treatment": "Lifestyle modifications, dietary changes, exercise program, stress management",
-                    "urgency": "routine"
-                },
-                "age_related": {
-                    "symptoms": ["age-related", "aging", "elderly", "pediatric"],
-                    "treatment": "Age-appropriate care, specialized evaluation, family involvement, monitoring",
-                    "urgency": "moderate"
-                },
-                "gender_specific": {
-                    "symptoms": ["gender-specific", "male-specific", "female-specific", "reproductive"],
-                    "treatment": "Gender-appropriate evaluation, specialized care, reproductive health assessment",
-                    "urgency": "moderate"
-                },
-                "seasonal_condition": {
-                    "symptoms": ["seasonal", "weather-related", "climate-related", "environmental"],
-                    "treatment": "Seasonal management, environmental modifications, preventive measures",
-                    "urgency": "routine"
-                },
-                "travel_related": {
-                    "symptoms": ["travel-related", "tropical", "imported", "exotic"],
-                    "treatment": "Travel history assessment, tropical medicine evaluation, specialized testing",
-                    "urgency": "moderate"
-                },
-                "immunocompromised": {
-                    "symptoms": ["immunocompromised", "immunosuppressed", "immune", "defense"],
-                    "treatment": "Immunocompromised care, infection prevention, specialized monitoring",
-                    "urgency": "urgent"
-                },
-                "stress_anxiety": {
-                    "symptoms": ["tired", "weak", "nervous", "worried", "tense"],
-                    "treatment": "Stress management, relaxation, counseling",
-                    "urgency": "routine"
-                },
-                "vitamin_deficiency": {
-                    "symptoms": ["tired", "weak", "pale", "dry", "brittle"],
-                    "treatment": "Vitamin supplements, dietary changes",
-                    "urgency": "routine"
-                },
-                "circulation_problems": {
-                    "symptoms": ["pale", "white", "cold", "numb", "tingling"],
-                    "treatment": "Improve circulation, medical evaluation",
-                    "urgency": "moderate"
-                },
-                "metabolic_disorder": {
-                    "symptoms": ["tired", "weak", "pale", "weight changes"],
-                    "treatment": "Medical evaluation, blood tests, treatment",
-                    "urgency": "moderate"
-                }
-            }
-        }
+        return GENERAL_MEDICAL_KNOWLEDGE
     
     async def analyze_any_symptom(self, symptom_text: str, patient_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze ANY symptom text and provide intelligent interpretation"""
+        # The analysis is CPU-only and short, so it runs inline rather than
+        # paying for a thread hop per request
+        return self.analyze_any_symptom_sync(symptom_text, patient_data)
+    
+    async def analyze_many(self, symptom_texts: List[str], patient_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Analyze several symptom texts for one patient without blocking the event loop"""
+        # asyncio is only needed here and is the bulk of this module's import time
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: [self.analyze_any_symptom_sync(symptom_text, patient_data) for symptom_text in symptom_texts]
+        )
+    
+    def analyze_any_symptom_sync(self, symptom_text: str, patient_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Synchronous core of analyze_any_symptom for callers outside an event loop"""
+        try:
+            patient_key = CacheKey(
+                freeze_value({field: patient_data[field] for field in ANALYZED_PATIENT_FIELDS if field in patient_data}),
+                patient_data
+            )
+        except TypeError:
+            # Patient data holding unhashable values is analyzed without caching
+            return self._analyze_symptom(symptom_text, patient_data)
+        
+        # Cached results are shared, so every caller gets its own copy
+        return copy_structure(self._cached_analysis(symptom_text, patient_key))
+    
+    def _analyze_patient_key(self, symptom_text: str, patient_key: CacheKey) -> Dict[str, Any]:
+        """Analyze the patient data carried by a cache key"""
+        return self._analyze_symptom(symptom_text, patient_key.take_payload())
+    
+    def _analyze_symptom(self, symptom_text: str, patient_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the full analysis pipeline for one symptom text"""
         try:
+            # The text is lowercased once and shared by every keyword check
+            symptom_lower = symptom_text.lower()
+            
             # Step 1: Intelligent symptom interpretation
-            interpreted_symptom = self._interpret_symptom_intelligently(symptom_text)
+            interpreted_symptom = self._interpret_symptom_intelligently(symptom_text, symptom_lower)
             
             # Step 2: Generate possible conditions
             possible_conditions = self._generate_possible_conditions(interpreted_symptom, patient_data)
             
             # Step 3: Assess urgency and risk
-            urgency_assessment = self._assess_urgency_intelligently(interpreted_symptom, patient_data)
+            urgency_assessment = self._assess_urgency_intelligently(interpreted_symptom, patient_data, symptom_lower)
             
             # Step 4: Generate treatment recommendations
             treatment_recommendations = self._generate_treatment_recommendations(possible_conditions, patient_data)
@@ -390,41 +893,13 @@ class IntelligentAIAgent:
             # Fallback: Always provide some analysis
             return self._provide_fallback_analysis(symptom_text, patient_data)
     
-    def _interpret_symptom_intelligently(self, symptom_text: str) -> IntelligentSymptom:
+    def _interpret_symptom_intelligently(self, symptom_text: str, symptom_lower: Optional[str] = None) -> IntelligentSymptom:
         """Intelligently interpret any symptom text"""
-        symptom_lower = symptom_text.lower()
-        
-        # Find matching patterns
-        interpreted_symptoms = []
-        category = SymptomCategory.ROUTINE
-        confidence = 0.5
-        reasoning = "General symptom analysis"
-        related_conditions = []
+        if symptom_lower is None:
+            symptom_lower = symptom_text.lower()
         
-        # Check for emergency keywords first
-        for emergency_word in self.emergency_keywords:
-            if emergency_word in symptom_lower:
-                category = SymptomCategory.EMERGENCY
-                confidence = 0.95  # Higher confidence for emergency detection
-                reasoning = f"EMERGENCY: Critical symptom detected - {emergency_word}"
-                break
-        
-        # Pattern matching
-        for pattern_name, keywords in self.symptom_patterns.items():
-            for keyword in keywords:
-                if keyword in symptom_lower:
-                    interpreted_symptoms.append(pattern_name)
-                    if category == SymptomCategory.ROUTINE:
-                        category = SymptomCategory.URGENT if "pain" in pattern_name or "breathing" in pattern_name else SymptomCategory.ROUTINE
-                    confidence = max(confidence, 0.7)
-                    reasoning = f"Pattern matched: {pattern_name} (keyword: {keyword})"
-                    break
-        
-        # If no patterns matched, use general interpretation
-        if not interpreted_symptoms:
-            interpreted_symptoms = ["general_symptom"]
-            reasoning = "General symptom interpretation - no specific patterns detected"
-            confidence = 0.3
+        # Keyword interpretation is a pure function of the text and is cached
+        interpreted_symptoms, category, confidence, reasoning = interpret_symptom_text(symptom_lower)
         
         # Generate related conditions based on interpreted symptoms
         related_conditions = self._get_related_conditions(interpreted_symptoms)
@@ -435,61 +910,30 @@ class IntelligentAIAgent:
             category=category,
             confidence=confidence,
             reasoning=reasoning,
-            related_conditions=related_conditions
+            related_conditions=tuple(related_conditions)
         )
     
     def _generate_possible_conditions(self, interpreted_symptom: IntelligentSymptom, patient_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate possible medical conditions based on interpreted symptoms"""
-        conditions = []
-        
-        # Check against general medical knowledge
-        for condition_name, condition_info in self.general_medical_knowledge["general_conditions"].items():
-            symptom_match_score = 0
-            total_symptoms = len(condition_info["symptoms"])
-            
-            for interpreted_symptom_name in interpreted_symptom.interpreted_symptoms:
-                for condition_symptom in condition_info["symptoms"]:
-                    if condition_symptom in interpreted_symptom_name or interpreted_symptom_name in condition_symptom:
-                        symptom_match_score += 1
-                        break
-            
-            # Calculate confidence based on symptom matches
-            if symptom_match_score > 0:
-                confidence = min(symptom_match_score / total_symptoms + 0.3, 0.9)
-                
-                # Adjust confidence based on patient data
-                if patient_data.get("age", 0) > 65:
-                    confidence += 0.1  # Higher risk for elderly
-                
-                if len(patient_data.get("medical_history", [])) > 2:
-                    confidence += 0.1  # Multiple comorbidities
-                
-                conditions.append({
-                    "condition": condition_name.replace("_", " ").title(),
-                    "confidence": min(confidence, 1.0),
-                    "urgency": condition_info["urgency"],
-                    "treatment": condition_info["treatment"],
-                    "reasoning": f"Based on symptom pattern matching and general medical knowledge",
-                    "supporting_evidence": condition_info["symptoms"]
-                })
-        
-        # If no conditions found, provide general assessment
-        if not conditions:
-            conditions.append({
-                "condition": "General Medical Assessment",
-                "confidence": 0.4,
-                "urgency": "routine",
-                "treatment": "Medical evaluation recommended",
-                "reasoning": "Symptom requires medical evaluation for proper diagnosis",
-                "supporting_evidence": ["Symptom presentation", "Patient history"]
-            })
-        
-        # Sort by confidence
-        conditions.sort(key=lambda x: x["confidence"], reverse=True)
-        return conditions[:3]  # Top 3 conditions
+        # Ranking depends on the patient only through these two flags, so it
+        # is cached on them; callers get fresh dicts they are free to modify
+        ranked_conditions = rank_general_conditions(
+            interpreted_symptom.interpreted_symptoms,
+            patient_data.get("age", 0) > 65,
+            len(patient_data.get("medical_history", [])) > 2
+        )
+        return [
+            {**condition, "supporting_evidence": list(condition["supporting_evidence"])}
+            for condition in ranked_conditions
+        ]
     
-    def _assess_urgency_intelligently(self, interpreted_symptom: IntelligentSymptom, patient_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _assess_urgency_intelligently(self, interpreted_symptom: IntelligentSymptom, patient_data: Dict[str, Any],
+                                      symptom_lower: Optional[str] = None,
+                                      include_categories: bool = True) -> Dict[str, Any]:
         """Comprehensive AI-powered risk assessment for any symptom"""
+        if symptom_lower is None:
+            symptom_lower = interpreted_symptom.original_text.lower()
+        
         urgency = "routine"
         risk_factors = []
         risk_score = 0.0
@@ -500,45 +944,28 @@ class IntelligentAIAgent:
             urgency = "emergency"
             risk_score = 0.95
             risk_factors.append("Critical emergency symptom detected")
-            risk_details["emergency_type"] = self._identify_emergency_type(interpreted_symptom.original_text)
-            risk_details["immediate_actions"] = self._get_emergency_actions(interpreted_symptom.original_text)
-        
-        # 2. SYMPTOM-SPECIFIC RISK ANALYSIS
-        symptom_risk = self._analyze_symptom_specific_risks(interpreted_symptom.original_text, patient_data)
-        risk_factors.extend(symptom_risk["factors"])
-        risk_score += symptom_risk["score"]
-        risk_details.update(symptom_risk["details"])
-        
-        # 3. PATIENT DEMOGRAPHIC RISK ASSESSMENT
-        demographic_risk = self._assess_demographic_risks(patient_data)
-        risk_factors.extend(demographic_risk["factors"])
-        risk_score += demographic_risk["score"]
-        risk_details.update(demographic_risk["details"])
+            risk_details["emergency_type"] = self._identify_emergency_type(symptom_lower)
+            risk_details["immediate_actions"] = self._get_emergency_actions(symptom_lower)
         
-        # 4. MEDICAL HISTORY RISK ANALYSIS
-        history_risk = self._analyze_medical_history_risks(patient_data)
-        risk_factors.extend(history_risk["factors"])
-        risk_score += history_risk["score"]
-        risk_details.update(history_risk["details"])
-        
-        # 5. MEDICATION INTERACTION RISKS
-        medication_risk = self._assess_medication_risks(patient_data)
-        risk_factors.extend(medication_risk["factors"])
-        risk_score += medication_risk["score"]
-        risk_details.update(medication_risk["details"])
+        # 2-5. SYMPTOM-SPECIFIC, DEMOGRAPHIC, MEDICAL HISTORY AND MEDICATION RISKS
+        # Patient fields are read once and every analysis appends straight
+        # into the shared factors and details; each returns its own score
+        age = patient_data.get("age", 0)
+        gender = patient_data.get("gender", "").lower()
+        partial_scores = (
+            self._add_symptom_specific_risks(symptom_lower, age, gender, risk_factors, risk_details),
+            self._add_demographic_risks(age, gender, risk_factors, risk_details),
+            self._add_medical_history_risks(patient_data.get("medical_history", []), risk_factors, risk_details),
+            self._add_medication_risks(patient_data.get("current_medications", []), risk_factors, risk_details)
+        )
         
-        # 6. COMPREHENSIVE RISK STRATIFICATION
-        risk_stratification = self._perform_risk_stratification(risk_score, risk_factors, patient_data)
+        # 6. TOTAL RISK SCORE AND URGENCY LEVEL
+        risk_score, urgency = aggregate_risk_score(risk_score, partial_scores)
         
-        # 7. DETERMINE URGENCY LEVEL
-        if risk_score >= 0.8:
-            urgency = "emergency"
-        elif risk_score >= 0.6:
-            urgency = "urgent"
-        elif risk_score >= 0.4:
-            urgency = "moderate"
-        else:
-            urgency = "routine"
+        # 7. COMPREHENSIVE RISK STRATIFICATION
+        risk_stratification = self._perform_risk_stratification(
+            risk_score, risk_factors, patient_data, include_categories=include_categories
+        )
         
         return {
             "urgency": urgency,
@@ -552,20 +979,8 @@ class IntelligentAIAgent:
     
     def _generate_treatment_recommendations(self, conditions: List[Dict[str, Any]], patient_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate treatment recommendations for any condition"""
-        treatments = []
-        
-        for condition in conditions:
-            if condition["confidence"] > 0.4:  # Only recommend treatments for conditions with reasonable confidence
-                treatments.append({
-                    "treatment_type": "general",
-                    "condition": condition["condition"],
-                    "recommendation": condition["treatment"],
-                    "confidence": condition["confidence"],
-                    "urgency": condition["urgency"],
-                    "instructions": f"Based on {condition['condition']} assessment",
-                    "side_effects": ["Monitor for improvement or worsening"],
-                    "contraindications": ["Allergic reactions to recommended treatments"]
-                })
+        # Only recommend treatments for conditions with reasonable confidence
+        treatments = [make_condition_treatment(condition) for condition in conditions if condition["confidence"] > 0.4]
         
         # Always provide general supportive care
         treatments.append({
@@ -583,28 +998,8 @@ class IntelligentAIAgent:
     
     def _provide_general_medical_advice(self, interpreted_symptom: IntelligentSymptom, patient_data: Dict[str, Any]) -> List[str]:
         """Provide general medical advice for any symptom"""
-        advice = []
-        
         # General advice based on symptom category
-        if interpreted_symptom.category == SymptomCategory.EMERGENCY:
-            advice.extend([
-                "IMMEDIATE EMERGENCY - Call 911 immediately",
-                "Do not delay - this is a medical emergency",
-                "Stay with the patient until emergency services arrive",
-                "If trained, begin CPR if patient is not breathing"
-            ])
-        elif interpreted_symptom.category == SymptomCategory.URGENT:
-            advice.extend([
-                "Schedule medical evaluation within 24-48 hours",
-                "Monitor symptoms closely",
-                "Seek immediate care if symptoms worsen"
-            ])
-        else:
-            advice.extend([
-                "Schedule routine medical evaluation",
-                "Monitor symptoms for changes",
-                "Maintain healthy lifestyle habits"
-            ])
+        advice = list(CATEGORY_ADVICE.get(interpreted_symptom.category, ROUTINE_ADVICE))
         
         # Age-specific advice
         age = patient_data.get("age", 0)
@@ -613,10 +1008,11 @@ class IntelligentAIAgent:
         
         # Condition-specific advice
         medical_history = patient_data.get("medical_history", [])
-        if "diabetes" in " ".join(medical_history).lower():
-            advice.append("Monitor blood glucose levels closely")
-        if "hypertension" in " ".join(medical_history).lower():
-            advice.append("Monitor blood pressure regularly")
+        history_blob = " ".join(medical_history).lower() if medical_history else ""
+        advice.extend(
+            condition_advice for condition, condition_advice in HISTORY_CONDITION_ADVICE
+            if condition in history_blob
+        )
         
         return advice
     
@@ -625,143 +1021,85 @@ class IntelligentAIAgent:
         if not conditions:
             return 0.3
         
-        # Base confidence on symptom interpretation
-        base_confidence = interpreted_symptom.confidence
-        
-        # Adjust based on condition confidence
-        avg_condition_confidence = sum(c["confidence"] for c in conditions) / len(conditions)
-        
-        # Combined confidence
-        combined_confidence = (base_confidence + avg_condition_confidence) / 2
-        
-        return min(combined_confidence, 1.0)
+        return combine_confidence(interpreted_symptom.confidence, tuple(c["confidence"] for c in conditions))
     
     def _generate_ai_reasoning(self, interpreted_symptom: IntelligentSymptom, conditions: List[Dict[str, Any]]) -> str:
         """Generate AI reasoning for the analysis"""
-        reasoning_parts = []
-        
-        reasoning_parts.append(f"AI interpreted '{interpreted_symptom.original_text}' as: {', '.join(interpreted_symptom.interpreted_symptoms)}")
-        reasoning_parts.append(f"Confidence in interpretation: {interpreted_symptom.confidence:.2f}")
-        reasoning_parts.append(f"Reasoning: {interpreted_symptom.reasoning}")
-        
         if conditions:
-            top_condition = conditions[0]
-            reasoning_parts.append(f"Most likely condition: {top_condition['condition']} (confidence: {top_condition['confidence']:.2f})")
+            top_condition_name, top_confidence = CONDITION_SUMMARY_FIELDS(conditions[0])
+            top_condition_text = f". Most likely condition: {top_condition_name} (confidence: {top_confidence:.2f})"
+        else:
+            top_condition_text = ""
         
-        return ". ".join(reasoning_parts) + "."
+        return (
+            f"AI interpreted '{interpreted_symptom.original_text}' as: {', '.join(interpreted_symptom.interpreted_symptoms)}. "
+            f"Confidence in interpretation: {interpreted_symptom.confidence:.2f}. "
+            f"Reasoning: {interpreted_symptom.reasoning}{top_condition_text}."
+        )
     
-    def _get_related_conditions(self, interpreted_symptoms: List[str]) -> List[str]:
+    def _get_related_conditions(self, interpreted_symptoms: Tuple[str, ...]) -> List[str]:
         """Get related conditions based on interpreted symptoms"""
-        related = []
+        # Dict keys drop duplicates while keeping first-seen order
+        related: Dict[str, None] = {}
         
         for symptom in interpreted_symptoms:
-            if "pale" in symptom or "white" in symptom:
-                related.extend(["anemia", "dehydration", "circulation problems", "shock"])
-            elif "pain" in symptom:
-                related.extend(["inflammation", "injury", "infection", "chronic pain"])
-            elif "breathing" in symptom:
-                related.extend(["respiratory infection", "asthma", "allergic reaction"])
-            elif "tired" in symptom or "weak" in symptom:
-                related.extend(["fatigue", "anemia", "infection", "metabolic disorder"])
+            # One scan finds every marker; the first rule with a hit applies
+            found_markers = RELATED_CONDITION_MATCHER.find(symptom)
+            if not found_markers:
+                continue
+            for markers, conditions in RELATED_CONDITION_RULES:
+                if not found_markers.isdisjoint(markers):
+                    related.update(dict.fromkeys(conditions))
+                    break
         
-        return list(set(related))  # Remove duplicates
+        return list(related)
     
     def _provide_fallback_analysis(self, symptom_text: str, patient_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Provide fallback analysis when main analysis fails"""
+        """Provide fallback analysis when main analysis fails; nested values are shared, read-only"""
         return {
-            "symptom_interpretation": {
-                "original_text": symptom_text,
-                "interpreted_symptoms": ["general_symptom"],
-                "category": "routine",
-                "confidence": 0.3,
-                "reasoning": "Fallback analysis - symptom requires medical evaluation"
-            },
-            "possible_conditions": [{
-                "condition": "Medical Evaluation Required",
-                "confidence": 0.5,
-                "urgency": "routine",
-                "treatment": "Schedule medical evaluation for proper diagnosis",
-                "reasoning": "Symptom requires professional medical assessment",
-                "supporting_evidence": ["Symptom presentation", "Patient history"]
-            }],
-            "urgency_assessment": {
-                "urgency": "routine",
-                "overall_risk": "low",
-                "risk_score": 0.3,
-                "risk_factors": ["Symptom requires evaluation"],
-                "reasoning": "Routine medical evaluation recommended"
-            },
-            "treatment_recommendations": [{
-                "treatment_type": "evaluation",
-                "condition": "Medical Assessment",
-                "recommendation": "Schedule medical evaluation",
-                "confidence": 0.8,
-                "urgency": "routine",
-                "instructions": "Professional medical evaluation recommended",
-                "side_effects": [],
-                "contraindications": []
-            }],
-            "general_advice": [
-                "Schedule medical evaluation",
-                "Monitor symptoms for changes",
-                "Seek immediate care if symptoms worsen"
-            ],
-            "confidence_score": 0.4,
+            **FALLBACK_ANALYSIS,
+            "symptom_interpretation": {**FALLBACK_ANALYSIS["symptom_interpretation"], "original_text": symptom_text},
             "ai_reasoning": f"Fallback analysis for symptom: {symptom_text}. Medical evaluation recommended for proper diagnosis."
         }
     
-    def _identify_emergency_type(self, symptom: str) -> str:
-        """Identify the type of emergency based on symptom"""
-        symptom_lower = symptom.lower()
-        
-        if any(word in symptom_lower for word in ["unresponsive", "unconscious", "coma", "collapsed"]):
-            return "Loss of Consciousness"
-        elif any(word in symptom_lower for word in ["chest pain", "heart attack", "crushing"]):
-            return "Cardiac Emergency"
-        elif any(word in symptom_lower for word in ["can't breathe", "choking", "suffocating"]):
-            return "Respiratory Emergency"
-        elif any(word in symptom_lower for word in ["stroke", "facial drooping", "arm weakness"]):
-            return "Neurological Emergency"
-        elif any(word in symptom_lower for word in ["severe bleeding", "massive bleeding"]):
-            return "Hemorrhagic Emergency"
-        elif any(word in symptom_lower for word in ["allergic reaction", "anaphylaxis", "swelling throat"]):
-            return "Allergic Emergency"
-        else:
-            return "General Medical Emergency"
+    def _identify_emergency_type(self, symptom_lower: str) -> str:
+        """Identify the type of emergency based on lowercased symptom text"""
+        # One scan finds every type keyword; the first type with a hit wins
+        found_keywords = EMERGENCY_TYPE_MATCHER.find(symptom_lower)
+        for type_keywords, emergency_type in EMERGENCY_TYPE_KEYWORDS:
+            if not type_keywords.isdisjoint(found_keywords):
+                return emergency_type
+        return "General Medical Emergency"
     
-    def _get_emergency_actions(self, symptom: str) -> List[str]:
-        """Get immediate actions for emergency symptoms"""
-        emergency_type = self._identify_emergency_type(symptom)
-        
-        actions = ["Call 911 immediately", "Stay with the patient"]
+    def _get_emergency_actions(self, symptom_lower: str) -> List[str]:
+        """Get immediate actions for emergency symptoms from lowercased symptom text"""
+        emergency_type = self._identify_emergency_type(symptom_lower)
         
-        if emergency_type == "Loss of Consciousness":
-            actions.extend(["Check breathing and pulse", "Begin CPR if trained and no pulse"])
-        elif emergency_type == "Cardiac Emergency":
-            actions.extend(["Administer aspirin if conscious", "Keep patient calm and still"])
-        elif emergency_type == "Respiratory Emergency":
-            actions.extend(["Check airway", "Begin rescue breathing if trained"])
-        elif emergency_type == "Neurological Emergency":
-            actions.extend(["Note time of onset", "Keep patient still", "Do not give food or water"])
-        elif emergency_type == "Hemorrhagic Emergency":
-            actions.extend(["Apply direct pressure to bleeding", "Elevate injured area if possible"])
-        elif emergency_type == "Allergic Emergency":
-            actions.extend(["Use epinephrine auto-injector if available", "Monitor breathing"])
-        
-        return actions
+        return [*EMERGENCY_BASE_ACTIONS, *EMERGENCY_TYPE_ACTIONS.get(emergency_type, ())]
     
-    def _analyze_symptom_specific_risks(self, symptom: str, patient_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze risks specific to the symptom type"""
+    def _analyze_symptom_specific_risks(self, symptom_lower: str, patient_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze risks specific to the symptom type from lowercased symptom text"""
         risk_factors = []
-        risk_score = 0.0
         details = {}
+        risk_score = self._add_symptom_specific_risks(
+            symptom_lower, patient_data.get("age", 0), patient_data.get("gender", "").lower(), risk_factors, details
+        )
+        return {
+            "factors": risk_factors,
+            "score": risk_score,
+            "details": details
+        }
+    
+    def _add_symptom_specific_risks(self, symptom_lower: str, age: Any, gender: str,
+                                    risk_factors: List[str], details: Dict[str, str]) -> float:
+        """Append symptom-type risks to risk_factors and details and return their score"""
+        risk_score = 0.0
         
-        symptom_lower = symptom.lower()
-        age = patient_data.get("age", 0)
-        gender = patient_data.get("gender", "").lower()
+        # Every group keyword present in the text, found in a single pass
+        found_keywords = SYMPTOM_RISK_MATCHER.find(symptom_lower)
         
         # Cardiovascular symptoms
-        if any(word in symptom_lower for word in ["chest", "heart", "pain", "pressure"]):
+        if not found_keywords.isdisjoint(CARDIOVASCULAR_RISK_KEYWORDS):
             risk_score += 0.3
             risk_factors.append("Cardiovascular symptom presentation")
             if age > 50:
@@ -773,7 +1111,7 @@ class IntelligentAIAgent:
             details["cardiovascular_risk"] = "High - requires immediate evaluation"
         
         # Neurological symptoms
-        elif any(word in symptom_lower for word in ["head", "brain", "dizzy", "confused", "weakness"]):
+        elif not found_keywords.isdisjoint(NEUROLOGICAL_RISK_KEYWORDS):
             risk_score += 0.25
             risk_factors.append("Neurological symptom presentation")
             if age > 65:
@@ -782,7 +1120,7 @@ class IntelligentAIAgent:
             details["neurological_risk"] = "Moderate to high - requires evaluation"
         
         # Respiratory symptoms
-        elif any(word in symptom_lower for word in ["breath", "cough", "wheeze", "shortness"]):
+        elif not found_keywords.isdisjoint(RESPIRATORY_RISK_KEYWORDS):
             risk_score += 0.2
             risk_factors.append("Respiratory symptom presentation")
             if age > 70:
@@ -791,7 +1129,7 @@ class IntelligentAIAgent:
             details["respiratory_risk"] = "Moderate - monitor closely"
         
         # Gastrointestinal symptoms
-        elif any(word in symptom_lower for word in ["stomach", "nausea", "vomit", "diarrhea", "abdominal"]):
+        elif not found_keywords.isdisjoint(GASTROINTESTINAL_RISK_KEYWORDS):
             risk_score += 0.15
             risk_factors.append("Gastrointestinal symptom presentation")
             if age > 60:
@@ -805,42 +1143,32 @@ class IntelligentAIAgent:
             risk_factors.append("General symptom presentation")
             details["general_risk"] = "Low - routine evaluation recommended"
         
+        return risk_score
+    
+    def _assess_demographic_risks(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Assess risks based on patient demographics"""
+        risk_factors = []
+        details = {}
+        risk_score = self._add_demographic_risks(
+            patient_data.get("age", 0), patient_data.get("gender", "").lower(), risk_factors, details
+        )
         return {
             "factors": risk_factors,
             "score": risk_score,
             "details": details
         }
     
-    def _assess_demographic_risks(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Assess risks based on patient demographics"""
-        risk_factors = []
+    def _add_demographic_risks(self, age: Any, gender: str, risk_factors: List[str], details: Dict[str, str]) -> float:
+        """Append demographic risks to risk_factors and details and return their score"""
         risk_score = 0.0
-        details = {}
-        
-        age = patient_data.get("age", 0)
-        gender = patient_data.get("gender", "").lower()
         
         # Age-based risk assessment
-        if age >= 80:
-            risk_score += 0.3
-            risk_factors.append("Very advanced age (80+)")
-            details["age_risk"] = "Very high - increased vulnerability"
-        elif age >= 70:
-            risk_score += 0.2
-            risk_factors.append("Advanced age (70-79)")
-            details["age_risk"] = "High - increased medical risk"
-        elif age >= 60:
-            risk_score += 0.15
-            risk_factors.append("Elderly (60-69)")
-            details["age_risk"] = "Moderate - age-related risk factors"
-        elif age >= 50:
-            risk_score += 0.1
-            risk_factors.append("Middle-aged (50-59)")
-            details["age_risk"] = "Low to moderate - baseline risk"
-        elif age < 18:
-            risk_score += 0.1
-            risk_factors.append("Pediatric patient")
-            details["age_risk"] = "Special considerations for pediatric care"
+        age_band = AGE_RISK_BANDS[bisect_right(AGE_RISK_BOUNDARIES, age)]
+        if age_band is not None:
+            age_score, age_factor, age_detail = age_band
+            risk_score += age_score
+            risk_factors.append(age_factor)
+            details["age_risk"] = age_detail
         
         # Gender-based risk factors
         if gender == "male":
@@ -852,39 +1180,32 @@ class IntelligentAIAgent:
             risk_factors.append("Female gender - hormonal considerations")
             details["gender_risk"] = "Hormonal and reproductive health considerations"
         
+        return risk_score
+    
+    def _analyze_medical_history_risks(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze risks based on medical history"""
+        risk_factors = []
+        details = {}
+        risk_score = self._add_medical_history_risks(patient_data.get("medical_history", []), risk_factors, details)
         return {
             "factors": risk_factors,
             "score": risk_score,
             "details": details
         }
     
-    def _analyze_medical_history_risks(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze risks based on medical history"""
-        risk_factors = []
+    def _add_medical_history_risks(self, medical_history: List[str], risk_factors: List[str],
+                                   details: Dict[str, str]) -> float:
+        """Append medical history risks to risk_factors and details and return their score"""
         risk_score = 0.0
-        details = {}
-        
-        medical_history = patient_data.get("medical_history", [])
         
         # High-risk chronic conditions
-        high_risk_conditions = {
-            "diabetes": {"score": 0.2, "description": "Diabetes - metabolic complications risk"},
-            "hypertension": {"score": 0.15, "description": "Hypertension - cardiovascular risk"},
-            "heart disease": {"score": 0.25, "description": "Heart disease - cardiac complications risk"},
-            "kidney disease": {"score": 0.2, "description": "Kidney disease - renal complications risk"},
-            "liver disease": {"score": 0.2, "description": "Liver disease - hepatic complications risk"},
-            "cancer": {"score": 0.3, "description": "Cancer history - increased vulnerability"},
-            "stroke": {"score": 0.25, "description": "Stroke history - neurological risk"},
-            "copd": {"score": 0.2, "description": "COPD - respiratory complications risk"},
-            "asthma": {"score": 0.15, "description": "Asthma - respiratory risk"},
-            "depression": {"score": 0.1, "description": "Depression - mental health considerations"},
-            "anxiety": {"score": 0.1, "description": "Anxiety - mental health considerations"}
-        }
-        
         for condition in medical_history:
-            condition_lower = condition.lower()
-            for risk_condition, risk_data in high_risk_conditions.items():
-                if risk_condition in condition_lower:
+            # One scan per condition finds every high-risk name it mentions
+            found_conditions = HIGH_RISK_CONDITION_MATCHER.find(condition.lower())
+            if not found_conditions:
+                continue
+            for risk_condition, risk_data in HIGH_RISK_CONDITIONS.items():
+                if risk_condition in found_conditions:
                     risk_score += risk_data["score"]
                     risk_factors.append(risk_data["description"])
                     details[f"condition_{risk_condition}"] = f"High risk due to {condition}"
@@ -895,35 +1216,30 @@ class IntelligentAIAgent:
             risk_factors.append("Multiple chronic conditions - increased complexity")
             details["multiple_conditions"] = "High complexity due to multiple comorbidities"
         
+        return risk_score
+    
+    def _assess_medication_risks(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Assess risks based on current medications"""
+        risk_factors = []
+        details = {}
+        risk_score = self._add_medication_risks(patient_data.get("current_medications", []), risk_factors, details)
         return {
             "factors": risk_factors,
             "score": risk_score,
             "details": details
         }
     
-    def _assess_medication_risks(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Assess risks based on current medications"""
-        risk_factors = []
+    def _add_medication_risks(self, medications: List[str], risk_factors: List[str], details: Dict[str, str]) -> float:
+        """Append medication risks to risk_factors and details and return their score"""
         risk_score = 0.0
-        details = {}
-        
-        medications = patient_data.get("current_medications", [])
-        
-        # High-risk medication categories
-        high_risk_medications = {
-            "warfarin": {"score": 0.2, "description": "Anticoagulant - bleeding risk"},
-            "insulin": {"score": 0.15, "description": "Insulin - hypoglycemia risk"},
-            "digoxin": {"score": 0.15, "description": "Digoxin - cardiac toxicity risk"},
-            "lithium": {"score": 0.2, "description": "Lithium - toxicity risk"},
-            "methotrexate": {"score": 0.2, "description": "Methotrexate - toxicity risk"},
-            "prednisone": {"score": 0.1, "description": "Steroid - immunosuppression risk"},
-            "opioid": {"score": 0.15, "description": "Opioid - respiratory depression risk"}
-        }
         
         for medication in medications:
-            medication_lower = medication.lower()
-            for risk_med, risk_data in high_risk_medications.items():
-                if risk_med in medication_lower:
+            # One scan per medication finds every high-risk name it mentions
+            found_medications = HIGH_RISK_MEDICATION_MATCHER.find(medication.lower())
+            if not found_medications:
+                continue
+            for risk_med, risk_data in HIGH_RISK_MEDICATIONS.items():
+                if risk_med in found_medications:
                     risk_score += risk_data["score"]
                     risk_factors.append(risk_data["description"])
                     details[f"medication_{risk_med}"] = f"High risk medication: {medication}"
@@ -934,14 +1250,11 @@ class IntelligentAIAgent:
             risk_factors.append("Polypharmacy - drug interaction risk")
             details["polypharmacy"] = "High risk of drug interactions"
         
-        return {
-            "factors": risk_factors,
-            "score": risk_score,
-            "details": details
-        }
+        return risk_score
     
-    def _perform_risk_stratification(self, risk_score: float, risk_factors: List[str], patient_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Perform comprehensive risk stratification"""
+    def _perform_risk_stratification(self, risk_score: float, risk_factors: List[str], patient_data: Dict[str, Any],
+                                     include_categories: bool = True) -> Dict[str, Any]:
+        """Perform comprehensive risk stratification, optionally without the risk categories"""
         
         # Determine risk level
         if risk_score >= 0.8:
@@ -960,67 +1273,39 @@ class IntelligentAIAgent:
             risk_level = "minimal"
             risk_description = "Minimal risk - self-monitoring sufficient"
         
-        # Risk categories
-        risk_categories = {
-            "demographic": [f for f in risk_factors if any(word in f.lower() for word in ["age", "gender", "pediatric"])],
-            "medical_history": [f for f in risk_factors if any(word in f.lower() for word in ["diabetes", "hypertension", "heart", "kidney", "cancer"])],
-            "medications": [f for f in risk_factors if any(word in f.lower() for word in ["medication", "drug", "anticoagulant", "insulin"])],
-            "symptom_specific": [f for f in risk_factors if any(word in f.lower() for word in ["symptom", "presentation", "emergency"])]
-        }
-        
-        return {
+        stratification = {
             "level": risk_level,
             "description": risk_description,
-            "score": risk_score,
-            "categories": risk_categories,
-            "total_factors": len(risk_factors),
-            "primary_concerns": risk_factors[:3] if risk_factors else ["No specific risk factors identified"]
+            "score": risk_score
         }
+        
+        # Risk categories, only built when the caller reports them
+        if include_categories:
+            stratification["categories"] = self._categorize_risk_factors(risk_factors)
+        
+        stratification["total_factors"] = len(risk_factors)
+        stratification["primary_concerns"] = risk_factors[:3] if risk_factors else ["No specific risk factors identified"]
+        return stratification
+    
+    def _categorize_risk_factors(self, risk_factors: List[str]) -> Dict[str, List[str]]:
+        """Group risk factors by stratification category"""
+        risk_categories: Dict[str, List[str]] = {category: [] for category, _ in RISK_CATEGORY_KEYWORDS}
+        for factor in risk_factors:
+            for category in classify_risk_factor(factor):
+                risk_categories[category].append(factor)
+        return risk_categories
     
     def _generate_risk_recommendations(self, urgency: str, risk_score: float, risk_factors: List[str]) -> List[str]:
         """Generate specific recommendations based on risk assessment"""
-        recommendations = []
-        
-        if urgency == "emergency":
-            recommendations.extend([
-                "IMMEDIATE EMERGENCY MEDICAL ATTENTION REQUIRED",
-                "Call 911 immediately",
-                "Do not delay medical care",
-                "Stay with patient until emergency services arrive"
-            ])
-        elif urgency == "urgent":
-            recommendations.extend([
-                "Seek medical attention within 24 hours",
-                "Monitor symptoms closely",
-                "Go to emergency room if symptoms worsen",
-                "Contact healthcare provider immediately"
-            ])
-        elif urgency == "moderate":
-            recommendations.extend([
-                "Schedule medical evaluation within 48-72 hours",
-                "Monitor symptoms and vital signs",
-                "Seek immediate care if symptoms worsen",
-                "Consider urgent care if primary care unavailable"
-            ])
-        else:
-            recommendations.extend([
-                "Schedule routine medical follow-up",
-                "Monitor symptoms at home",
-                "Seek medical attention if symptoms persist or worsen",
-                "Maintain regular health monitoring"
-            ])
-        
-        # Add specific recommendations based on risk factors
-        if any("diabetes" in factor.lower() for factor in risk_factors):
-            recommendations.append("Monitor blood glucose levels closely")
-        
-        if any("heart" in factor.lower() for factor in risk_factors):
-            recommendations.append("Monitor heart rate and blood pressure")
-        
-        if any("breathing" in factor.lower() for factor in risk_factors):
-            recommendations.append("Monitor respiratory rate and oxygen saturation")
-        
-        if any("age" in factor.lower() for factor in risk_factors):
-            recommendations.append("Consider age-related vulnerability factors")
+        recommendations = list(URGENCY_RECOMMENDATIONS.get(urgency, ROUTINE_RECOMMENDATIONS))
+        
+        # Add specific recommendations based on risk factors; the factors are
+        # lowercased as one newline-joined text, which no keyword can span,
+        # and the matcher finds every keyword in a single scan
+        found_keywords = RISK_FACTOR_KEYWORD_MATCHER.find("\n".join(risk_factors).lower())
+        recommendations.extend(
+            recommendation for keyword, recommendation in RISK_FACTOR_RECOMMENDATIONS
+            if keyword in found_keywords
+        )
         
         return recommendations
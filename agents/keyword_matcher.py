@@ -0,0 +1,61 @@
+"""
+Keyword Matcher - Single-pass multi-keyword substring matching for the agents
+"""
+
+import re
+import sys
+from typing import Dict, FrozenSet, Iterable
+
+def build_trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a regex matching the longest keyword at a position, factored as a prefix trie"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}  # keyword ends here
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A greedy optional tail prefers the longer keyword when a shorter one ends here
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+class KeywordMatcher:
+    """Finds every keyword that occurs as a substring of a text in one regex scan"""
+
+    def __init__(self, keywords: Iterable[str]):
+        # Longest keywords first so each scan position reports its longest match;
+        # keywords are interned so lookups with interned texts compare by identity
+        self.keywords = tuple(sorted({sys.intern(keyword) for keyword in keywords}, key=len, reverse=True))
+
+        # A keyword contained in a longer one is reported whenever the longer one is,
+        # which keeps results identical to testing every keyword with ``in``
+        self.contained: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(other for other in self.keywords if other in keyword)
+            for keyword in self.keywords
+        }
+
+        # Zero-width lookahead so overlapping occurrences are all visited; the
+        # trie layout shares common prefixes, so each position costs one walk
+        # down the trie instead of one attempt per keyword
+        self.pattern = re.compile(f"(?=({build_trie_pattern(self.keywords)}))") if self.keywords else None
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Return the set of keywords that occur in text"""
+        if self.pattern is None:
+            return frozenset()
+
+        # A text that is exactly a keyword contains just that keyword's substrings
+        contained = self.contained.get(text)
+        if contained is not None:
+            return contained
+
+        found = set()
+        for keyword in self.pattern.findall(text):
+            found.update(self.contained[keyword])
+        return frozenset(found)
@@ -0,0 +1,44 @@
+"""
+Result Cache - Helpers for caching agent results keyed by JSON-like inputs
+"""
+
+from typing import Any
+
+def freeze_value(value: Any) -> Any:
+    """Hashable equivalent of a JSON-like value, for use in cache keys"""
+    if isinstance(value, dict):
+        return frozenset((key, freeze_value(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze_value(item) for item in value)
+    return value
+
+class CacheKey:
+    """Cache key comparing a frozen value that carries the call's inputs to the cached function"""
+    __slots__ = ("frozen", "hash", "payload")
+    
+    def __init__(self, frozen: Any, payload: Any):
+        self.frozen = frozen
+        self.hash = hash(frozen)  # raises TypeError for unhashable values
+        self.payload = payload
+    
+    def __hash__(self) -> int:
+        return self.hash
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CacheKey) and self.frozen == other.frozen
+    
+    def take_payload(self) -> Any:
+        """Return the carried inputs and drop them from the key"""
+        # The cache keeps the key, so it should not also keep the caller's data alive
+        payload, self.payload = self.payload, None
+        return payload
+
+def copy_structure(value: Any) -> Any:
+    """Copy the dicts and lists of a result, sharing its immutable leaves"""
+    if isinstance(value, dict):
+        return {key: copy_structure(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_structure(item) for item in value]
+    return value
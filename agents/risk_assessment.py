@@ -2,118 +2,348 @@
 Risk Assessment Agent - Evaluates potential complications and urgency
 """
 
+import asyncio
 import json
-from typing import Dict, List, Any
-from agents.base_agent import BaseHealthcareAgent, PatientData
+import re
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterable, List, Any, NamedTuple, Optional, Tuple
+from itertools import chain
+from agents.base_agent import BaseHealthcareAgent, PatientData, dumps_json, loads_json
+from agents.keyword_matcher import KeywordMatcher
+from agents.result_cache import CacheKey, copy_structure, freeze_value
 from uagents import Context
 import logging
 
 logger = logging.getLogger(__name__)
 
+# History keywords that mark a chronic condition
+CHRONIC_CONDITION_KEYWORDS: FrozenSet[str] = frozenset({"diabetes", "heart", "kidney", "liver", "lung"})
+CHRONIC_CONDITION_MATCHER = KeywordMatcher(CHRONIC_CONDITION_KEYWORDS)
+
+# Monitoring recommended for every patient
+GENERAL_MONITORING: Tuple[str, ...] = (
+    "Regular symptom assessment",
+    "Medication adherence monitoring",
+    "Follow-up appointment scheduling"
+)
+
+# Risk points added per complication, by severity; other severities add none
+SEVERITY_SCORES: Dict[str, float] = {
+    "critical": 0.3,
+    "high": 0.2,
+    "moderate": 0.1
+}
+
+# Complication probability multiplier per number of risk factors present,
+# computed as 1 + count * 0.2 exactly as the per-complication formula does
+RISK_FACTOR_MULTIPLIERS: Tuple[float, ...] = tuple(1 + count * 0.2 for count in range(16))
+
+# Monitoring recommendation prefix per complication severity
+SEVERITY_MONITORING: Dict[str, str] = {
+    "critical": "Continuous monitoring for",
+    "high": "Frequent monitoring for"
+}
+
+# Blood pressure readings as "systolic/diastolic"; the diastolic value may be absent
+BLOOD_PRESSURE_PATTERN = re.compile(r"\s*([+-]?\d+(?:\.\d+)?)\s*/\s*([+-]?\d+(?:\.\d+)?)?")
+
+def parse_blood_pressure(blood_pressure: Any) -> Optional[Tuple[float, Optional[float]]]:
+    """Return (systolic, diastolic) from a blood pressure reading, or None if it is not one"""
+    if not isinstance(blood_pressure, str):
+        return None
+    match = BLOOD_PRESSURE_PATTERN.match(blood_pressure)
+    if match is None:
+        if "/" in blood_pressure:
+            logger.warning(f"Ignoring unparseable blood pressure reading: {blood_pressure!r}")
+        return None
+    systolic, diastolic = match.groups()
+    return float(systolic), float(diastolic) if diastolic is not None else None
+
+# Age-based complication risk factors and the check each one applies to the patient's age
+AGE_RISK_FACTORS: Dict[str, Callable[[int], bool]] = {
+    "age > 65": lambda age: age > 65,
+    "age > 75": lambda age: age > 75,
+}
+
+def parse_risk_factor(risk_factor: str) -> Tuple[Optional[Callable[[int], bool]], Tuple[str, ...]]:
+    """Return the age check (if any) and the history/medication keywords of a risk factor"""
+    risk_factor_lower = risk_factor.lower()
+    for age_risk_factor, age_check in AGE_RISK_FACTORS.items():
+        if age_risk_factor in risk_factor_lower:
+            return age_check, ()
+    return None, tuple(risk_factor_lower.split())
+
+def intern_complication_models(complication_models: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Intern complication names and severities in place so severity lookups compare by identity"""
+    for model in complication_models.values():
+        for complication in model["complications"]:
+            complication["name"] = sys.intern(complication["name"])
+            complication["severity"] = sys.intern(complication["severity"])
+    return complication_models
+
+def build_risk_factor_terms(complication_models: Dict[str, Dict[str, Any]]) -> Dict[str, Tuple[Optional[Callable[[int], bool]], Tuple[str, ...]]]:
+    """Pre-parse every complication risk factor of the given models"""
+    return {
+        risk_factor: parse_risk_factor(risk_factor)
+        for model in complication_models.values()
+        for complication in model["complications"]
+        for risk_factor in complication["risk_factors"]
+    }
+
+def build_complication_masks(complication_models: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, int], Dict[str, Tuple[Optional[int], ...]]]:
+    """Give every complication risk factor a bit and encode each complication's risk factors as a mask
+
+    Returns the bit of each risk factor and, per condition, one mask per complication.
+    A complication listing a risk factor twice counts it twice, which a mask cannot
+    express, so it gets None and is checked factor by factor instead.
+    """
+    risk_factor_bits: Dict[str, int] = {}
+    complication_masks: Dict[str, Tuple[Optional[int], ...]] = {}
+    for condition, model in complication_models.items():
+        masks = []
+        for complication in model["complications"]:
+            risk_factors = complication["risk_factors"]
+            mask = 0
+            for risk_factor in risk_factors:
+                mask |= risk_factor_bits.setdefault(risk_factor, 1 << len(risk_factor_bits))
+            masks.append(mask if len(set(risk_factors)) == len(risk_factors) else None)
+        complication_masks[condition] = tuple(masks)
+    return risk_factor_bits, complication_masks
+
+class ComplicationTally(NamedTuple):
+    """Severity counts of a list of complications and their running risk score"""
+    critical: int
+    high: int
+    moderate: int
+    score: float
+
+def tally_complications(complications: List[Dict[str, Any]], base_score: float = 0.0) -> ComplicationTally:
+    """Count complications by severity and add their risk points to base_score in one pass"""
+    counts = dict.fromkeys(SEVERITY_SCORES, 0)
+    score = base_score
+    for complication in complications:
+        severity = complication["severity"]
+        points = SEVERITY_SCORES.get(severity)
+        if points is not None:
+            counts[severity] += 1
+            score += points
+    return ComplicationTally(counts["critical"], counts["high"], counts["moderate"], score)
+
+# Inputs are small counts, so every level is computed once
+@lru_cache(maxsize=1024)
+def overall_risk_level(risk_factor_count: int, severe_count: int, moderate_count: int) -> str:
+    """Overall risk level for the given numbers of risk factors and high/critical and moderate complications"""
+    # Count risk factors
+    risk_score = risk_factor_count
+    
+    # Count high-severity complications
+    risk_score += severe_count * 2
+    
+    # Count moderate-severity complications
+    risk_score += moderate_count
+    
+    if risk_score >= 5:
+        return "high"
+    elif risk_score >= 2:
+        return "moderate"
+    else:
+        return "low"
+
+# Three flags, so there are only eight possible scores
+@lru_cache(maxsize=None)
+def data_confidence(many_symptoms: bool, has_history: bool, has_medications: bool) -> float:
+    """Assessment confidence from the completeness of the patient data"""
+    confidence = 0.5  # Base confidence
+    
+    if many_symptoms:
+        confidence += 0.1
+    if has_history:
+        confidence += 0.1
+    if has_medications:
+        confidence += 0.1
+    
+    return confidence
+
+# Risk factor database, shared by all RiskAssessment instances
+RISK_FACTORS: Dict[str, Dict[str, Any]] = {
+    "cardiovascular": {
+        "age": {"high": 65, "moderate": 45},
+        "conditions": ["diabetes", "hypertension", "heart disease", "smoking"],
+        "medications": ["warfarin", "aspirin", "clopidogrel"],
+        "vital_signs": {
+            "blood_pressure": {"high": 140, "moderate": 130},
+            "heart_rate": {"high": 100, "low": 50}
+        }
+    },
+    "respiratory": {
+        "age": {"high": 65, "moderate": 45},
+        "conditions": ["asthma", "copd", "smoking", "immunocompromised"],
+        "vital_signs": {
+            "oxygen_saturation": {"low": 90},
+            "respiratory_rate": {"high": 25, "low": 12}
+        }
+    },
+    "infectious": {
+        "age": {"high": 65, "moderate": 45},
+        "conditions": ["immunocompromised", "diabetes", "chronic_kidney_disease"],
+        "vital_signs": {
+            "temperature": {"high": 100.4, "low": 96.8}
+        }
+    }
+}
+
+# Complication prediction models, shared by all RiskAssessment instances;
+# names and severities are interned once at import
+COMPLICATION_MODELS: Dict[str, Dict[str, Any]] = intern_complication_models({
+    "myocardial_infarction": {
+        "complications": [
+            {
+                "name": "Heart Failure",
+                "risk_factors": ["age > 65", "diabetes", "previous MI"],
+                "probability": 0.15,
+                "severity": "high"
+            },
+            {
+                "name": "Arrhythmia",
+                "risk_factors": ["age > 65", "heart disease"],
+                "probability": 0.25,
+                "severity": "moderate"
+            },
+            {
+                "name": "Cardiogenic Shock",
+                "risk_factors": ["age > 75", "diabetes", "previous MI"],
+                "probability": 0.05,
+                "severity": "critical"
+            }
+        ]
+    },
+    "pneumonia": {
+        "complications": [
+            {
+                "name": "Respiratory Failure",
+                "risk_factors": ["age > 65", "copd", "immunocompromised"],
+                "probability": 0.20,
+                "severity": "high"
+            },
+            {
+                "name": "Sepsis",
+                "risk_factors": ["age > 65", "diabetes", "immunocompromised"],
+                "probability": 0.10,
+                "severity": "critical"
+            },
+            {
+                "name": "Pleural Effusion",
+                "risk_factors": ["age > 65", "heart failure"],
+                "probability": 0.15,
+                "severity": "moderate"
+            }
+        ]
+    }
+})
+
+# Common spellings of each modelled condition mapped to its model key, so
+# diagnoses naming a known condition skip lowercasing and replacing
+CONDITION_KEYS: Dict[str, str] = {
+    spelling: condition
+    for condition in COMPLICATION_MODELS
+    for display_name in (condition.replace("_", " "),)
+    for spelling in (condition, display_name, display_name.title(), display_name.capitalize(), display_name.upper())
+}
+
+# Display name of each modelled condition as reported with its complications
+CONDITION_DISPLAY_NAMES: Dict[str, str] = {
+    condition: condition.replace("_", " ").title() for condition in COMPLICATION_MODELS
+}
+
+# Complication risk factors parsed once instead of on every check
+RISK_FACTOR_TERMS = build_risk_factor_terms(COMPLICATION_MODELS)
+
+# Bit per complication risk factor and the risk factor mask of every complication
+RISK_FACTOR_BITS, COMPLICATION_RISK_MASKS = build_complication_masks(COMPLICATION_MODELS)
+
+# Single-pass matcher over every history/medication keyword of those risk factors
+RISK_KEYWORD_MATCHER = KeywordMatcher(
+    keyword for _, keywords in RISK_FACTOR_TERMS.values() for keyword in keywords
+)
+
+# Agent addresses whose patient data was already validated upstream (the
+# CareCoordinator serializes it from a PatientData). Their requests skip
+# re-validation; every other sender is still fully validated
+TRUSTED_SENDERS: FrozenSet[str] = frozenset()
+
+# Synthetic request run once before the agent starts serving. It touches the
+# age, history, medication and vital sign checks and a modelled diagnosis
+WARM_UP_PATIENT: Dict[str, Any] = {
+    "patient_id": "warm-up",
+    "age": 70,
+    "gender": "unknown",
+    "symptoms": ["chest pain"],
+    "medical_history": ["diabetes"],
+    "current_medications": ["aspirin"],
+    "vital_signs": {"blood_pressure": "150/90"},
+    "timestamp": "2024-01-01T00:00:00"
+}
+WARM_UP_DIAGNOSES: List[Dict[str, Any]] = [{"condition": "Myocardial Infarction", "confidence": 0.9}]
+
+# Assessments kept per agent. Retries and dashboards re-score the same patient
+# and diagnoses, and each entry is a small result dict
+ASSESSMENT_CACHE_SIZE = 1024
+
 class RiskAssessment(BaseHealthcareAgent):
     """Agent that assesses patient risk and potential complications"""
     
-    def __init__(self, seed_phrase: str):
+    def __init__(self, seed_phrase: str, trusted_senders: Optional[Iterable[str]] = None):
         super().__init__("RiskAssessment", "risk_assessment", seed_phrase)
+        self.trusted_senders = TRUSTED_SENDERS if trusted_senders is None else frozenset(trusted_senders)
+        # Shared, process-wide risk factor database and complication models
         self.risk_factors = self.load_risk_factors()
         self.complication_models = self.load_complication_models()
+        # Shared, process-wide risk factor terms and matcher (built once at import);
+        # risk factors outside them are checked by a direct scan
+        self.risk_factor_terms = RISK_FACTOR_TERMS
+        self.risk_keyword_matcher = RISK_KEYWORD_MATCHER
+        # Risk factor bits and complication masks, rebuilt only for overridden models
+        if self.complication_models is COMPLICATION_MODELS:
+            self.risk_factor_bits, self.complication_risk_masks = RISK_FACTOR_BITS, COMPLICATION_RISK_MASKS
+        else:
+            self.risk_factor_bits, self.complication_risk_masks = build_complication_masks(self.complication_models)
+        # Per-agent LRU cache of assessments keyed by patient data and diagnoses
+        self._cached_assessment = lru_cache(maxsize=ASSESSMENT_CACHE_SIZE)(self._assess_key)
+    
+    def warm_up(self):
+        """Run one synthetic assessment so the first real request skips first-call costs"""
+        # Bypasses the assessment cache so no synthetic result takes a slot
+        patient_data = PatientData(**WARM_UP_PATIENT)
+        dumps_json(self._assess_patient_risk(patient_data, WARM_UP_DIAGNOSES))
+    
+    def run(self):
+        """Warm up the assessment path, then run the agent"""
+        self.warm_up()
+        super().run()
     
     def load_risk_factors(self) -> Dict[str, Dict[str, Any]]:
         """Load risk factor database"""
-        return {
-            "cardiovascular": {
-                "age": {"high": 65, "moderate": 45},
-                "conditions": ["diabetes", "hypertension", "heart disease", "smoking"],
-                "medications": ["warfarin", "aspirin", "clopidogrel"],
-                "vital_signs": {
-                    "blood_pressure": {"high": 140, "moderate": 130},
-                    "heart_rate": {"high": 100, "low": 50}
-                }
-            },
-            "respiratory": {
-                "age": {"high": 65, "moderate": 45},
-                "conditions": ["asthma", "copd", "smoking", "immunocompromised"],
-                "vital_signs": {
-                    "oxygen_saturation": {"low": 90},
-                    "respiratory_rate": {"high": 25, "low": 12}
-                }
-            },
-            "infectious": {
-                "age": {"high": 65, "moderate": 45},
-                "conditions": ["immunocompromised", "diabetes", "chronic_kidney_disease"],
-                "vital_signs": {
-                    "temperature": {"high": 100.4, "low": 96.8}
-                }
-            }
-        }
+        return RISK_FACTORS
     
     def load_complication_models(self) -> Dict[str, Dict[str, Any]]:
         """Load complication prediction models"""
-        return {
-            "myocardial_infarction": {
-                "complications": [
-                    {
-                        "name": "Heart Failure",
-                        "risk_factors": ["age > 65", "diabetes", "previous MI"],
-                        "probability": 0.15,
-                        "severity": "high"
-                    },
-                    {
-                        "name": "Arrhythmia",
-                        "risk_factors": ["age > 65", "heart disease"],
-                        "probability": 0.25,
-                        "severity": "moderate"
-                    },
-                    {
-                        "name": "Cardiogenic Shock",
-                        "risk_factors": ["age > 75", "diabetes", "previous MI"],
-                        "probability": 0.05,
-                        "severity": "critical"
-                    }
-                ]
-            },
-            "pneumonia": {
-                "complications": [
-                    {
-                        "name": "Respiratory Failure",
-                        "risk_factors": ["age > 65", "copd", "immunocompromised"],
-                        "probability": 0.20,
-                        "severity": "high"
-                    },
-                    {
-                        "name": "Sepsis",
-                        "risk_factors": ["age > 65", "diabetes", "immunocompromised"],
-                        "probability": 0.10,
-                        "severity": "critical"
-                    },
-                    {
-                        "name": "Pleural Effusion",
-                        "risk_factors": ["age > 65", "heart failure"],
-                        "probability": 0.15,
-                        "severity": "moderate"
-                    }
-                ]
-            }
-        }
+        return COMPLICATION_MODELS
     
     async def handle_text_message(self, ctx: Context, sender: str, text: str):
         """Handle incoming text messages"""
         try:
-            message_data = json.loads(text)
+            message_data = loads_json(text)
             
             if message_data.get("type") == "assess_risk":
-                patient_data = PatientData(**message_data["patient_data"])
-                diagnoses = message_data["diagnoses"]
-                
-                risk_result = await self.assess_patient_risk(patient_data, diagnoses)
-                
-                response = {
-                    "type": "risk_assessment_result",
-                    "risk_analysis": risk_result,
-                    "case_id": message_data.get("case_id"),
-                    "agent": self.name
-                }
-                await self.send_message(ctx, sender, json.dumps(response))
+                # Validation, assessment and serialization all run on a worker
+                # thread so other agents sharing the event loop are not stalled;
+                # sending stays on the loop, which owns the context
+                loop = asyncio.get_running_loop()
+                payload = await loop.run_in_executor(
+                    None, self.build_risk_response, message_data, sender in self.trusted_senders
+                )
+                await self.send_message(ctx, sender, payload)
                 
         except json.JSONDecodeError:
             if "risk" in text.lower():
@@ -122,8 +352,67 @@ class RiskAssessment(BaseHealthcareAgent):
             logger.error(f"Error in RiskAssessment: {e}")
             await self.send_message(ctx, sender, f"{self.name}: Error processing risk assessment request.")
     
+    def build_risk_response(self, message_data: Dict[str, Any], trusted: bool = False) -> str:
+        """Assess an assess_risk request and serialize the result message"""
+        # Trusted senders' patient data is rebuilt without re-running validation
+        if trusted:
+            patient_data = PatientData.model_construct(**message_data["patient_data"])
+        else:
+            patient_data = PatientData(**message_data["patient_data"])
+        diagnoses = message_data["diagnoses"]
+        
+        # The result is only serialized, so the cached assessment is encoded
+        # as is instead of being copied first
+        risk_result = self.shared_assessment(patient_data, diagnoses)
+        
+        response = {
+            "type": "risk_assessment_result",
+            "risk_analysis": risk_result,
+            "case_id": message_data.get("case_id"),
+            "agent": self.name
+        }
+        return dumps_json(response)
+    
     async def assess_patient_risk(self, patient_data: PatientData, diagnoses: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Comprehensive risk assessment"""
+        # The assessment is CPU-only and short, so it runs inline
+        return self.assess_patient_risk_sync(patient_data, diagnoses)
+    
+    async def assess_batch(self, patients: List[PatientData], diagnoses_batch: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Assess a cohort of patients, each with its own diagnoses, without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: [
+                self.assess_patient_risk_sync(patient_data, diagnoses)
+                for patient_data, diagnoses in zip(patients, diagnoses_batch)
+            ]
+        )
+    
+    def assess_patient_risk_sync(self, patient_data: PatientData, diagnoses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Synchronous core of assess_patient_risk for batch and non-async callers"""
+        # Cached results are shared, so every caller gets its own copy
+        return copy_structure(self.shared_assessment(patient_data, diagnoses))
+    
+    def shared_assessment(self, patient_data: PatientData, diagnoses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Assessment that may be shared through the cache; callers must not modify it"""
+        try:
+            assessment_key = CacheKey(
+                (freeze_value(patient_data.dict()), freeze_value(diagnoses)), (patient_data, diagnoses)
+            )
+        except TypeError:
+            # Inputs holding unhashable values are assessed without caching
+            return self._assess_patient_risk(patient_data, diagnoses)
+        
+        return self._cached_assessment(assessment_key)
+    
+    def _assess_key(self, assessment_key: CacheKey) -> Dict[str, Any]:
+        """Assess the patient data and diagnoses carried by a cache key"""
+        patient_data, diagnoses = assessment_key.take_payload()
+        return self._assess_patient_risk(patient_data, diagnoses)
+    
+    def _assess_patient_risk(self, patient_data: PatientData, diagnoses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run the full risk assessment for one patient"""
         risk_analysis = {
             "overall_risk": "low",
             "risk_factors": [],
@@ -134,37 +423,74 @@ class RiskAssessment(BaseHealthcareAgent):
             "risk_score": 0.0
         }
         
+        # Lowercase the history once for the risk factor checks
+        history_lower = [condition.lower() for condition in patient_data.medical_history]
+        
         # Assess risk factors
-        risk_factors = self.identify_risk_factors(patient_data)
+        risk_factors = self.identify_risk_factors(patient_data, history_lower)
         risk_analysis["risk_factors"] = risk_factors
         
+        # One pass over the diagnoses collects every confidence for the average and
+        # the model keys of the diagnoses above the confidence gate
+        confidences = []
+        gated_conditions = []
+        for diagnosis in diagnoses:
+            diagnosis_confidence = diagnosis["confidence"]
+            confidences.append(diagnosis_confidence)
+            if diagnosis_confidence > 0.5:
+                condition_name = diagnosis["condition"]
+                gated_conditions.append(CONDITION_KEYS.get(condition_name) or condition_name.lower().replace(" ", "_"))
+        avg_diagnosis_confidence = sum(confidences) / len(confidences) if confidences else None
+        
+        # Without a diagnosis above the confidence gate there are no complications,
+        # so the keyword scan and complication passes are skipped and the urgency
+        # comes from the patient alone (no diagnosis can pass the higher urgency gate)
+        if not gated_conditions:
+            tally = ComplicationTally(0, 0, 0, len(risk_factors) * 0.1)
+            risk_analysis["overall_risk"] = self.determine_overall_risk(risk_factors, [], tally)
+            risk_analysis["urgency_level"] = (
+                "moderate" if patient_data.age > 75 or len(patient_data.current_medications) > 4 else "routine"
+            )
+            risk_analysis["monitoring_required"] = self.generate_monitoring_recommendations(patient_data, [])
+            risk_analysis["risk_score"] = self.calculate_risk_score(risk_factors, [], tally)
+            risk_analysis["confidence"] = self.calculate_confidence(patient_data, diagnoses, avg_diagnosis_confidence)
+            return risk_analysis
+        
+        # Find every risk factor keyword in the history and medications in one
+        # scan, for all risk factor checks
+        patient_keywords = self.find_risk_keywords(patient_data)
+        
         # Assess complications for each diagnosis
         complications = []
-        for diagnosis in diagnoses:
-            if diagnosis["confidence"] > 0.5:
-                condition = diagnosis["condition"].lower().replace(" ", "_")
-                if condition in self.complication_models:
-                    condition_complications = self.assess_complications(patient_data, condition)
-                    complications.extend(condition_complications)
+        patient_mask = None  # built on the first modelled diagnosis
+        for condition in gated_conditions:
+            if condition in self.complication_models:
+                if patient_mask is None:
+                    patient_mask = self.patient_risk_mask(patient_data, patient_keywords)
+                condition_complications = self.assess_complications(patient_data, condition, patient_keywords, patient_mask)
+                complications.extend(condition_complications)
         
         risk_analysis["complications"] = complications
         
+        # One pass over the complications serves the overall risk, urgency and risk score
+        tally = tally_complications(complications, len(risk_factors) * 0.1)
+        
         # Determine overall risk level
-        risk_analysis["overall_risk"] = self.determine_overall_risk(risk_factors, complications)
+        risk_analysis["overall_risk"] = self.determine_overall_risk(risk_factors, complications, tally)
         
         # Determine urgency level
-        risk_analysis["urgency_level"] = self.determine_urgency(patient_data, diagnoses, complications)
+        risk_analysis["urgency_level"] = self.determine_urgency(patient_data, diagnoses, complications, tally)
         
         # Generate monitoring recommendations
         risk_analysis["monitoring_required"] = self.generate_monitoring_recommendations(patient_data, complications)
         
         # Calculate risk score and confidence
-        risk_analysis["risk_score"] = self.calculate_risk_score(risk_factors, complications)
-        risk_analysis["confidence"] = self.calculate_confidence(patient_data, diagnoses)
+        risk_analysis["risk_score"] = self.calculate_risk_score(risk_factors, complications, tally)
+        risk_analysis["confidence"] = self.calculate_confidence(patient_data, diagnoses, avg_diagnosis_confidence)
         
         return risk_analysis
     
-    def identify_risk_factors(self, patient_data: PatientData) -> List[str]:
+    def identify_risk_factors(self, patient_data: PatientData, history_lower: Optional[List[str]] = None) -> List[str]:
         """Identify patient risk factors"""
         risk_factors = []
         
@@ -175,22 +501,23 @@ class RiskAssessment(BaseHealthcareAgent):
             risk_factors.append("Pediatric patient")
         
         # Medical history risks
-        for condition in patient_data.medical_history:
-            condition_lower = condition.lower()
-            if any(keyword in condition_lower for keyword in ["diabetes", "heart", "kidney", "liver", "lung"]):
+        if history_lower is None:
+            history_lower = [condition.lower() for condition in patient_data.medical_history]
+        for condition, condition_lower in zip(patient_data.medical_history, history_lower):
+            if CHRONIC_CONDITION_MATCHER.find(condition_lower):
                 risk_factors.append(f"Chronic condition: {condition}")
         
         # Medication risks
         if len(patient_data.current_medications) > 3:
             risk_factors.append("Polypharmacy (>3 medications)")
         
-        # Vital signs risks
-        if "vital_signs" in patient_data.dict():
-            vital_signs = patient_data.vital_signs
+        # Vital signs risks, read directly rather than serializing the whole model
+        vital_signs = getattr(patient_data, "vital_signs", None)
+        if vital_signs is not None:
             if "blood_pressure" in vital_signs:
-                bp = vital_signs["blood_pressure"]
-                if isinstance(bp, str) and "/" in bp:
-                    systolic = int(bp.split("/")[0])
+                reading = parse_blood_pressure(vital_signs["blood_pressure"])
+                if reading is not None:
+                    systolic, _ = reading
                     if systolic > 140:
                         risk_factors.append("Hypertension")
             
@@ -208,85 +535,105 @@ class RiskAssessment(BaseHealthcareAgent):
         
         return risk_factors
     
-    def assess_complications(self, patient_data: PatientData, condition: str) -> List[Dict[str, Any]]:
+    def assess_complications(self, patient_data: PatientData, condition: str,
+                             patient_keywords: Optional[FrozenSet[str]] = None,
+                             patient_mask: Optional[int] = None) -> List[Dict[str, Any]]:
         """Assess potential complications for a specific condition"""
         complications = []
         
         if condition in self.complication_models:
             condition_complications = self.complication_models[condition]["complications"]
+            condition_display_name = CONDITION_DISPLAY_NAMES.get(condition) or condition.replace("_", " ").title()
+            complication_masks = self.complication_risk_masks.get(condition, ())
+            if patient_mask is None and complication_masks:
+                patient_mask = self.patient_risk_mask(patient_data, patient_keywords)
             
-            for complication in condition_complications:
-                # Check if patient has risk factors for this complication
-                risk_factor_count = 0
-                for risk_factor in complication["risk_factors"]:
-                    if self.check_risk_factor(patient_data, risk_factor):
-                        risk_factor_count += 1
+            for index, complication in enumerate(condition_complications):
+                # Count the patient's risk factors for this complication
+                complication_mask = complication_masks[index] if index < len(complication_masks) else None
+                if complication_mask is not None:
+                    risk_factor_count = bin(complication_mask & patient_mask).count("1")
+                else:
+                    risk_factor_count = 0
+                    for risk_factor in complication["risk_factors"]:
+                        if self.check_risk_factor(patient_data, risk_factor, patient_keywords):
+                            risk_factor_count += 1
                 
                 # Calculate adjusted probability based on risk factors
                 adjusted_probability = complication["probability"]
                 if risk_factor_count > 0:
-                    adjusted_probability *= (1 + risk_factor_count * 0.2)
+                    if risk_factor_count < len(RISK_FACTOR_MULTIPLIERS):
+                        adjusted_probability *= RISK_FACTOR_MULTIPLIERS[risk_factor_count]
+                    else:
+                        adjusted_probability *= (1 + risk_factor_count * 0.2)
                 
                 if adjusted_probability > 0.1:  # Only include complications with >10% probability
                     complications.append({
                         "name": complication["name"],
-                        "probability": min(adjusted_probability, 1.0),
+                        "probability": 1.0 if adjusted_probability > 1.0 else adjusted_probability,
                         "severity": complication["severity"],
                         "risk_factors_present": risk_factor_count,
-                        "condition": condition.replace("_", " ").title()
+                        "condition": condition_display_name
                     })
         
         return complications
     
-    def check_risk_factor(self, patient_data: PatientData, risk_factor: str) -> bool:
+    def patient_risk_mask(self, patient_data: PatientData, patient_keywords: Optional[FrozenSet[str]] = None) -> int:
+        """Mask of the complication risk factors the patient has, one bit per risk factor"""
+        if patient_keywords is None:
+            patient_keywords = self.find_risk_keywords(patient_data)
+        patient_mask = 0
+        for risk_factor, bit in self.risk_factor_bits.items():
+            if self.check_risk_factor(patient_data, risk_factor, patient_keywords):
+                patient_mask |= bit
+        return patient_mask
+    
+    def find_risk_keywords(self, patient_data: PatientData) -> FrozenSet[str]:
+        """Complication risk factor keywords found in the patient's history and medications"""
+        # Keywords hold no whitespace, so none can span two newline-joined entries
+        patient_text = "\n".join(chain(patient_data.medical_history, patient_data.current_medications)).lower()
+        return self.risk_keyword_matcher.find(patient_text)
+    
+    def check_risk_factor(self, patient_data: PatientData, risk_factor: str,
+                          patient_keywords: Optional[FrozenSet[str]] = None) -> bool:
         """Check if patient has a specific risk factor"""
-        risk_factor_lower = risk_factor.lower()
+        risk_factor_terms = self.risk_factor_terms.get(risk_factor)
+        age_check, keywords = risk_factor_terms or parse_risk_factor(risk_factor)
         
         # Age-based risk factors
-        if "age > 65" in risk_factor_lower:
-            return patient_data.age > 65
-        elif "age > 75" in risk_factor_lower:
-            return patient_data.age > 75
-        
-        # Medical history risk factors
-        for condition in patient_data.medical_history:
-            if any(keyword in condition.lower() for keyword in risk_factor_lower.split()):
-                return True
-        
-        # Medication risk factors
-        for medication in patient_data.current_medications:
-            if any(keyword in medication.lower() for keyword in risk_factor_lower.split()):
-                return True
-        
-        return False
+        if age_check:
+            return age_check(patient_data.age)
+        
+        # Risk factors outside the complication models are not in the matcher,
+        # so their keywords are searched for in each entry directly
+        if risk_factor_terms is None:
+            return any(
+                keyword in entry.lower()
+                for entry in chain(patient_data.medical_history, patient_data.current_medications)
+                for keyword in keywords
+            )
+        
+        # Medical history and medication risk factors
+        if patient_keywords is None:
+            patient_keywords = self.find_risk_keywords(patient_data)
+        return not patient_keywords.isdisjoint(keywords)
     
-    def determine_overall_risk(self, risk_factors: List[str], complications: List[Dict[str, Any]]) -> str:
+    def determine_overall_risk(self, risk_factors: List[str], complications: List[Dict[str, Any]],
+                               tally: Optional[ComplicationTally] = None) -> str:
         """Determine overall risk level"""
-        risk_score = 0
-        
-        # Count risk factors
-        risk_score += len(risk_factors)
+        if tally is None:
+            tally = tally_complications(complications)
         
-        # Count high-severity complications
-        high_severity_complications = [c for c in complications if c["severity"] in ["high", "critical"]]
-        risk_score += len(high_severity_complications) * 2
-        
-        # Count moderate-severity complications
-        moderate_severity_complications = [c for c in complications if c["severity"] == "moderate"]
-        risk_score += len(moderate_severity_complications)
-        
-        if risk_score >= 5:
-            return "high"
-        elif risk_score >= 2:
-            return "moderate"
-        else:
-            return "low"
+        return overall_risk_level(len(risk_factors), tally.critical + tally.high, tally.moderate)
     
-    def determine_urgency(self, patient_data: PatientData, diagnoses: List[Dict[str, Any]], complications: List[Dict[str, Any]]) -> str:
+    def determine_urgency(self, patient_data: PatientData, diagnoses: List[Dict[str, Any]], complications: List[Dict[str, Any]],
+                          tally: Optional[ComplicationTally] = None) -> str:
         """Determine urgency level for patient care"""
+        if tally is None:
+            tally = tally_complications(complications)
+        
         # Check for critical complications
-        critical_complications = [c for c in complications if c["severity"] == "critical"]
-        if critical_complications:
+        if tally.critical:
             return "urgent"
         
         # Check for high-confidence urgent diagnoses
@@ -305,65 +652,51 @@ class RiskAssessment(BaseHealthcareAgent):
     
     def generate_monitoring_recommendations(self, patient_data: PatientData, complications: List[Dict[str, Any]]) -> List[str]:
         """Generate monitoring recommendations based on risk assessment"""
-        monitoring = []
+        # Dict keys drop duplicates while keeping first-seen order
+        monitoring: Dict[str, None] = {}
         
         # Age-based monitoring
         if patient_data.age > 65:
-            monitoring.append("Close vital signs monitoring")
-            monitoring.append("Frequent assessment for deterioration")
+            monitoring["Close vital signs monitoring"] = None
+            monitoring["Frequent assessment for deterioration"] = None
         
         # Complication-based monitoring
         for complication in complications:
-            if complication["severity"] == "critical":
-                monitoring.append(f"Continuous monitoring for {complication['name']}")
-            elif complication["severity"] == "high":
-                monitoring.append(f"Frequent monitoring for {complication['name']}")
+            prefix = SEVERITY_MONITORING.get(complication["severity"])
+            if prefix is not None:
+                monitoring[f"{prefix} {complication['name']}"] = None
         
         # General monitoring
-        monitoring.extend([
-            "Regular symptom assessment",
-            "Medication adherence monitoring",
-            "Follow-up appointment scheduling"
-        ])
+        monitoring.update(dict.fromkeys(GENERAL_MONITORING))
         
-        return list(set(monitoring))  # Remove duplicates
+        return list(monitoring)
     
-    def calculate_risk_score(self, risk_factors: List[str], complications: List[Dict[str, Any]]) -> float:
-        """Calculate numerical risk score"""
-        score = 0.0
-        
-        # Base score from risk factors
-        score += len(risk_factors) * 0.1
-        
-        # Add complication scores
-        for complication in complications:
-            if complication["severity"] == "critical":
-                score += 0.3
-            elif complication["severity"] == "high":
-                score += 0.2
-            elif complication["severity"] == "moderate":
-                score += 0.1
-        
-        return min(score, 1.0)  # Cap at 1.0
+    def calculate_risk_score(self, risk_factors: List[str], complications: List[Dict[str, Any]],
+                             tally: Optional[ComplicationTally] = None) -> float:
+        """Calculate numerical risk score from a tally started at len(risk_factors) * 0.1"""
+        if tally is None:
+            # Base score from risk factors plus the complication scores
+            tally = tally_complications(complications, len(risk_factors) * 0.1)
+        
+        return 1.0 if tally.score > 1.0 else tally.score  # Cap at 1.0
     
-    def calculate_confidence(self, patient_data: PatientData, diagnoses: List[Dict[str, Any]]) -> float:
-        """Calculate confidence in risk assessment"""
-        confidence = 0.5  # Base confidence
-        
+    def calculate_confidence(self, patient_data: PatientData, diagnoses: List[Dict[str, Any]],
+                             avg_diagnosis_confidence: Optional[float] = None) -> float:
+        """Calculate confidence in risk assessment, from the average diagnosis confidence when it is known"""
         # Increase confidence with more data
-        if len(patient_data.symptoms) > 2:
-            confidence += 0.1
-        if len(patient_data.medical_history) > 0:
-            confidence += 0.1
-        if len(patient_data.current_medications) > 0:
-            confidence += 0.1
+        confidence = data_confidence(
+            len(patient_data.symptoms) > 2,
+            len(patient_data.medical_history) > 0,
+            len(patient_data.current_medications) > 0
+        )
         
         # Increase confidence with high-confidence diagnoses
         if diagnoses:
-            avg_diagnosis_confidence = sum(d["confidence"] for d in diagnoses) / len(diagnoses)
+            if avg_diagnosis_confidence is None:
+                avg_diagnosis_confidence = sum(d["confidence"] for d in diagnoses) / len(diagnoses)
             confidence += avg_diagnosis_confidence * 0.2
         
-        return min(confidence, 1.0)  # Cap at 1.0
+        return 1.0 if confidence > 1.0 else confidence  # Cap at 1.0
 
 # Create and run the agent
 if __name__ == "__main__":
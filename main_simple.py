@@ -140,7 +140,9 @@ async def simulate_agent_collaboration(patient_data: Dict[str, Any]) -> Dict[str
             "patient_data": patient_data
         }
         
-        symptom_result = await symptom_analyzer.process_message(symptom_message)
+        # patient_data is built from the validated PatientRequest, so the
+        # agents can skip validating it again
+        symptom_result = await symptom_analyzer.process_message_cached(symptom_message, trusted=True)
         symptom_analysis = symptom_result["analysis"]
         
         # Step 2: Diagnosis
@@ -150,7 +152,7 @@ async def simulate_agent_collaboration(patient_data: Dict[str, Any]) -> Dict[str
             "symptom_analysis": symptom_analysis
         }
         
-        diagnosis_result = await diagnosis_specialist.process_message(diagnosis_message)
+        diagnosis_result = await diagnosis_specialist.process_message_cached(diagnosis_message, trusted=True)
         diagnoses = diagnosis_result["diagnoses"]
         
         # Step 3: If no diagnoses from standard agents, use intelligent AI results